@@ -0,0 +1,169 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from cache import MemoryCache
+
+# Quantization steps: advice only changes when a number crosses one of these
+MONEY_STEP = 5.0
+RATE_STEP = 1.0
+PERCENT_STEP = 5.0
+
+
+def quantize(value: float, step: float) -> float:
+    return round(value / step) * step
+
+
+def advice_fingerprint(money_left: float, days_left: int, burn_rate: float, safe_daily_spend: float,
+                       total_income: float, total_spent: float, category_percentages: Dict[str, float]) -> str:
+    """Hash the coarse shape of a user's month so near-identical requests share advice."""
+    shape = {
+        "money_left": quantize(money_left, MONEY_STEP),
+        "days_left": days_left,
+        "burn_rate": quantize(burn_rate, RATE_STEP),
+        "safe_daily_spend": quantize(safe_daily_spend, RATE_STEP),
+        "total_income": quantize(total_income, MONEY_STEP),
+        "total_spent": quantize(total_spent, MONEY_STEP),
+        "categories": {cat: quantize(pct, PERCENT_STEP) for cat, pct in sorted(category_percentages.items())},
+    }
+    return hashlib.sha256(json.dumps(shape, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class AdviceMemo:
+    """Memoizes advice by fingerprint and coalesces concurrent identical requests.
+
+    `generate` is the upstream call (the LLM in production, a stub in tests).
+    `cache` is any async cache from cache.py, so several workers can share
+    one; coalescing of in-flight calls is per process. Only successful
+    completions are cached; a failure is raised to every caller waiting on
+    that fingerprint. The upstream call runs in its own task, so a caller
+    that goes away (say, a closed stream) leaves the others waiting on it.
+    """
+
+    def __init__(self, generate: Callable[[str], Awaitable[str]], cache=None, maxsize: int = 10000, ttl: float = 900.0):
+        self.generate = generate
+        self.cache = cache or MemoryCache(maxsize=maxsize, ttl=ttl)
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    async def get(self, fingerprint: str, prompt: str) -> str:
+        cached = await self.cache.get(fingerprint)
+        if cached is not None:
+            return cached
+
+        inflight = self._inflight.get(fingerprint)
+        if inflight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        task = asyncio.create_task(self._fetch(fingerprint, prompt))
+        # Mark a failure retrieved even when every caller has gone
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[fingerprint] = task
+        return await asyncio.shield(task)
+
+    async def _fetch(self, fingerprint: str, prompt: str) -> str:
+        try:
+            self.upstream_calls += 1
+            advice = await self.generate(prompt)
+            await self.cache.set(fingerprint, advice)
+            return advice
+        finally:
+            del self._inflight[fingerprint]
+
+    def stats(self) -> dict:
+        return {**self.cache.stats(), "upstream_calls": self.upstream_calls, "coalesced": self.coalesced}
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets one trial call through after a cool-down."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_inflight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_inflight:
+            self._trial_inflight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_inflight = False
+
+    def release_trial(self):
+        # A cancelled trial proves nothing either way; let the next call try again
+        self._trial_inflight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_inflight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class GuardedLLM:
+    """Wraps an upstream call with a concurrency limit, a deadline and a circuit breaker."""
+
+    def __init__(self, call: Callable[[str], Awaitable[str]], max_concurrency: int = 8,
+                 timeout: float = 15.0, breaker: Optional[CircuitBreaker] = None):
+        self.call = call
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __call__(self, prompt: str) -> str:
+        if not self.breaker.allow():
+            raise CircuitOpenError("LLM circuit is open")
+        try:
+            # The deadline covers waiting for a slot as well as the call itself
+            result = await asyncio.wait_for(self._limited_call(prompt), self.timeout)
+        except asyncio.CancelledError:
+            self.breaker.release_trial()
+            raise
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
+
+    async def _limited_call(self, prompt: str) -> str:
+        async with self._semaphore:
+            return await self.call(prompt)
+
+
+def rule_based_advice(money_left: float, days_left: int, burn_rate: float, safe_daily_spend: float,
+                      category_percentages: Dict[str, float]) -> str:
+    """Locally computed advice used when the LLM is slow, failing or switched off."""
+    top_category = max(category_percentages.items(), key=lambda item: item[1], default=None)
+    if money_left <= 0:
+        return f"Bro... you're €{abs(money_left):.2f} past your budget. Wallet stays closed until next month."
+    if days_left > 0 and burn_rate > safe_daily_spend:
+        advice = f"Chill. You're burning €{burn_rate:.2f}/day but only €{safe_daily_spend:.2f}/day is safe."
+        if top_category:
+            advice += f" {top_category[0]} is {top_category[1]:.0f}% of your spending, cut there first."
+        return advice
+    return f"Legend. You can safely spend €{safe_daily_spend:.2f} today. Keep it going!"
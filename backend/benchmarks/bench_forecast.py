@@ -0,0 +1,60 @@
+"""Throughput of the batched NumPy forecast, without a database.
+
+Builds synthetic daily spend for a batch of users (90 days of history plus
+the current month, six categories) and a few goals each, then times
+project_spending and project_goals per batch and extrapolates to users per
+second.
+
+Usage (from backend/):
+    python -m benchmarks.bench_forecast
+"""
+import statistics
+import time
+
+import numpy as np
+
+from forecast import project_goals, project_spending
+
+BATCH_SIZES = [100, 1_000, 5_000]
+CATEGORIES = 6
+HISTORY_DAYS = 90
+MONTH_DAYS = 30
+GOALS_PER_USER = 3
+RUNS = 10
+
+
+def make_batch(users: int, rng: np.random.Generator) -> tuple:
+    days = HISTORY_DAYS + MONTH_DAYS
+    spends = rng.random((users, CATEGORIES, days)) < 0.3
+    tensor = spends * rng.gamma(2.0, 10.0, size=(users, CATEGORIES, days))
+    income = rng.uniform(800, 3000, size=users)
+    goals = users * GOALS_PER_USER
+    contributions = (rng.random((goals, HISTORY_DAYS)) < 0.1) * rng.uniform(5, 50, size=(goals, HISTORY_DAYS))
+    first_day = rng.integers(0, HISTORY_DAYS, size=goals)
+    remaining = rng.uniform(100, 5000, size=goals)
+    deadlines = np.where(rng.random(goals) < 0.5, rng.uniform(10, 365, size=goals), np.nan)
+    return tensor, income, contributions, first_day, remaining, deadlines
+
+
+def main():
+    rng = np.random.default_rng(1234)
+    month_offset = HISTORY_DAYS
+    as_of = HISTORY_DAYS + MONTH_DAYS // 2
+    print(f"{'users':>7} {'spending ms':>12} {'goals ms':>9} {'users/s':>10}")
+    for users in BATCH_SIZES:
+        tensor, income, contributions, first_day, remaining, deadlines = make_batch(users, rng)
+        spending_timings, goal_timings = [], []
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            project_spending(tensor, income, month_offset, as_of)
+            spending_timings.append((time.perf_counter() - started) * 1000)
+            started = time.perf_counter()
+            project_goals(contributions, first_day, remaining, deadlines)
+            goal_timings.append((time.perf_counter() - started) * 1000)
+        spending = statistics.median(spending_timings)
+        goals = statistics.median(goal_timings)
+        print(f"{users:>7} {spending:>12.2f} {goals:>9.2f} {users / ((spending + goals) / 1000):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
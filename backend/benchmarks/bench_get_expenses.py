@@ -0,0 +1,96 @@
+"""Latency of the month expense listing as one user's history grows.
+
+Seeds a single user with a fixed month of expenses plus 1k, 10k and 100k
+rows of older history, then times `get_expenses` for that month at each
+size. With the (user_id, date) index the latency should stay flat.
+
+Usage (from backend/, against a local MongoDB):
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_get_expenses
+"""
+import asyncio
+import os
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'smartsave_bench')
+
+from fastapi import Response  # noqa: E402
+
+import server  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000]
+RUNS = 50
+MONTH_ROWS = 200
+CATEGORIES = ["Food", "Transport", "Rent", "Fun", "Shopping", "Other"]
+# History lives before the benchmarked month so its row count stays fixed.
+START_DATE = date(2018, 1, 1)
+SPAN_DAYS = (date(2024, 1, 1) - START_DATE).days
+
+
+def make_expense(user_id: str, day: date) -> dict:
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": user_id,
+        "amount": server.to_decimal(random.uniform(1, 80)),
+        "category": random.choice(CATEGORIES),
+        "note": None,
+        "date": server.as_datetime(day),
+        "created_at": server.as_datetime(day),
+    }
+
+
+async def seed(user_id: str, count: int):
+    batch = []
+    for _ in range(count):
+        day = START_DATE + timedelta(days=random.randrange(SPAN_DAYS))
+        batch.append(make_expense(user_id, day))
+        if len(batch) == 5000:
+            await server.db.expenses.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        await server.db.expenses.insert_many(batch, ordered=False)
+
+
+async def main():
+    server.connect_db()
+    await server.ensure_indexes()
+    # Only this run's user is touched, so an exported DB_NAME is never wiped
+    user_id = str(uuid.uuid4())
+    try:
+        await run(user_id)
+    finally:
+        await server.db.expenses.delete_many({"user_id": user_id})
+        server.client.close()
+
+
+async def run(user_id: str):
+    await server.db.expenses.insert_many([
+        make_expense(user_id, date(2024, 6, random.randint(1, 30)))
+        for _ in range(MONTH_ROWS)
+    ])
+    seeded = 0
+    print(f"{'history':>10} {'rows':>6} {'p50 ms':>8} {'p95 ms':>8}")
+    for size in SIZES:
+        await seed(user_id, size - seeded)
+        seeded = size
+        timings = []
+        rows = 0
+        for _ in range(RUNS):
+            started = time.perf_counter()
+            # Called directly, so every Query() default has to be passed explicitly
+            expenses = await server.get_expenses(
+                "6", 2024, response=Response(), after=None, limit=None, stream=False, fast=False, user_id=user_id
+            )
+            rows = len(expenses)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{size:>10} {rows:>6} {statistics.median(timings):>8.2f} {p95:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,60 @@
+"""Concurrent add-money calls against one goal must not lose updates.
+
+Fires CONTRIBUTIONS parallel POST /goals/{id}/add-money requests through
+the in-process app and checks the final total, the transaction count and
+that exactly one call reported the goal as completed.
+
+Usage (from backend/, against a local MongoDB):
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_goal_contributions
+"""
+import asyncio
+import os
+import time
+import uuid
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'smartsave_bench')
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+
+import httpx  # noqa: E402
+
+import server  # noqa: E402
+
+CONTRIBUTIONS = int(os.environ.get('CONTRIBUTIONS', '500'))
+AMOUNT = 2.5
+
+
+async def main():
+    server.connect_db()
+    await server.ensure_indexes()
+    user_id = str(uuid.uuid4())
+    headers = {"Authorization": f"Bearer {server.create_token(user_id)}"}
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as http:
+        target = CONTRIBUTIONS * AMOUNT / 2
+        goal = (await http.post("/api/goals", json={"name": "Bench", "icon": "x", "target_amount": target})).json()
+
+        started = time.perf_counter()
+        responses = await asyncio.gather(*[
+            http.post(f"/api/goals/{goal['id']}/add-money", json={"amount": AMOUNT})
+            for _ in range(CONTRIBUTIONS)
+        ])
+        elapsed = time.perf_counter() - started
+
+        stored = await server.db.goals.find_one({"id": goal['id']}, {"_id": 0})
+        transactions = await server.db.goal_transactions.count_documents({"goal_id": goal['id']})
+        completions = sum(1 for response in responses if response.json()['completed'])
+        expected = CONTRIBUTIONS * AMOUNT
+        print(f"{CONTRIBUTIONS} contributions in {elapsed:.2f}s ({CONTRIBUTIONS / elapsed:.0f}/s)")
+        print(f"total {stored['current_amount']} (expected {expected}), "
+              f"transactions {transactions}, completions {completions}")
+        await http.delete(f"/api/goals/{goal['id']}")
+
+    server.client.close()
+    assert stored['current_amount'] == expected, "lost updates"
+    assert transactions == CONTRIBUTIONS, "lost transactions"
+    assert completions == 1, "completion reported more than once"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""Latency of an unrelated endpoint while a storm of logins is in flight.
+
+Runs the app in-process and fires LOGINS concurrent logins while a probe
+repeatedly hits GET /api/. The probe's p50/p99 is reported twice: with
+bcrypt called inline on the event loop (the old behaviour) and with the
+bcrypt thread pool.
+
+Usage (from backend/, against a local MongoDB):
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_login_storm
+"""
+import asyncio
+import os
+import statistics
+import time
+import uuid
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'smartsave_bench')
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+
+import httpx  # noqa: E402
+
+import server  # noqa: E402
+
+LOGINS = int(os.environ.get('LOGINS', '200'))
+PASSWORD = "bench-password"
+
+
+async def run_inline(func, *args):
+    return func(*args)
+
+
+async def probe(http: httpx.AsyncClient, done: asyncio.Event) -> list:
+    timings = []
+    while not done.is_set():
+        started = time.perf_counter()
+        await http.get("/api/")
+        timings.append((time.perf_counter() - started) * 1000)
+        await asyncio.sleep(0.005)
+    return timings
+
+
+async def storm(http: httpx.AsyncClient, email: str) -> list:
+    probe_done = asyncio.Event()
+    probe_task = asyncio.create_task(probe(http, probe_done))
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*[
+        http.post("/api/auth/login", json={"email": email, "password": PASSWORD})
+        for _ in range(LOGINS)
+    ])
+    probe_done.set()
+    timings = await probe_task
+    return sorted(timings)
+
+
+def percentile(values: list, pct: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def main():
+    server.connect_db()
+    await server.ensure_indexes()
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+        await http.post("/api/auth/register", json={"email": email, "password": PASSWORD, "name": "Bench"})
+
+        pooled = server.run_in_bcrypt_pool
+        print(f"{'mode':>8} {'probes':>7} {'p50 ms':>8} {'p99 ms':>8}")
+        for mode, runner in (("inline", run_inline), ("pool", pooled)):
+            server.run_in_bcrypt_pool = runner
+            timings = await storm(http, email)
+            print(f"{mode:>8} {len(timings):>7} {statistics.median(timings):>8.2f} {percentile(timings, 0.99):>8.2f}")
+        server.run_in_bcrypt_pool = pooled
+
+        await server.db.users.delete_one({"email": email})
+    server.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
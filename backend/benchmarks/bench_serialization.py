@@ -0,0 +1,84 @@
+"""Encoding cost of an expense list: response_model path vs orjson fast path.
+
+The response_model path mirrors what FastAPI does for
+`response_model=List[Expense]`: parse ISO timestamps, validate every row,
+dump to JSON-compatible data and json.dumps it. The fast path hands the
+already-projected documents straight to orjson. No database is needed.
+
+Usage (from backend/):
+    python -m benchmarks.bench_serialization
+"""
+import json
+import os
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'smartsave_bench')
+
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+import server  # noqa: E402
+
+SIZES = [1_000, 10_000]
+RUNS = 20
+CATEGORIES = ["Food", "Transport", "Rent", "Fun", "Shopping", "Other"]
+
+
+def make_documents(count: int, iso_strings: bool) -> List[dict]:
+    base = datetime(2024, 6, 1, tzinfo=timezone.utc)
+    docs = []
+    for i in range(count):
+        created_at = base + timedelta(minutes=i)
+        docs.append({
+            "id": str(uuid.uuid4()),
+            "user_id": "bench",
+            "amount": round(random.uniform(1, 80), 2),
+            "category": random.choice(CATEGORIES),
+            "note": None,
+            "date": created_at.date().isoformat(),
+            "created_at": created_at.isoformat() if iso_strings else created_at,
+        })
+    return docs
+
+
+adapter = TypeAdapter(List[server.Expense])
+
+
+def response_model_path(docs: List[dict]) -> bytes:
+    for doc in docs:
+        if isinstance(doc['created_at'], str):
+            doc['created_at'] = datetime.fromisoformat(doc['created_at'])
+    validated = adapter.validate_python(docs)
+    return json.dumps(adapter.dump_python(validated, mode='json')).encode('utf-8')
+
+
+def fast_path(docs: List[dict]) -> bytes:
+    return orjson.dumps(docs)
+
+
+def time_path(func, make_docs) -> float:
+    timings = []
+    for _ in range(RUNS):
+        docs = make_docs()
+        started = time.perf_counter()
+        func(docs)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    print(f"{'rows':>7} {'response_model ms':>18} {'orjson ms':>10} {'speedup':>8}")
+    for size in SIZES:
+        old = time_path(response_model_path, lambda: make_documents(size, iso_strings=True))
+        new = time_path(fast_path, lambda: make_documents(size, iso_strings=False))
+        print(f"{size:>7} {old:>18.2f} {new:>10.2f} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
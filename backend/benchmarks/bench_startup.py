@@ -0,0 +1,105 @@
+"""Cold-start import cost of the API, checked against a budget.
+
+Imports `server` in fresh interpreters under `python -X importtime` and
+reports the median cumulative import time across runs, the whole-process
+wall time and the slowest modules server.py imports. Exits non-zero when the median
+import time exceeds the budget, or when a module that is meant to load
+lazily (the LLM client stack, NumPy) shows up at startup, so a CI step can
+catch cold-start regressions.
+
+Usage (from backend/):
+    python -m benchmarks.bench_startup --runs 5 --budget-ms 1000
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+LAZY_MODULES = ("emergentintegrations", "litellm", "openai", "google.genai", "google.generativeai", "boto3", "numpy")
+
+
+def parse_importtime(stderr: str) -> list:
+    """Return (depth, module, self_us, cumulative_us) for every `-X importtime` line."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue
+        name = name[1:]
+        module = name.lstrip(" ")
+        entries.append(((len(name) - len(module)) // 2, module, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def import_server() -> tuple:
+    env = dict(os.environ)
+    env.setdefault("MONGO_URL", "mongodb://localhost:27017")
+    env.setdefault("DB_NAME", "smartsave_bench")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import server"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing server failed:\n{result.stderr[-2000:]}")
+    return elapsed_ms, parse_importtime(result.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import cost of the API")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=float, default=float(os.environ.get('STARTUP_BUDGET_MS', '1000')),
+                        help="maximum median import time of server.py")
+    parser.add_argument('--top', type=int, default=15, help="slowest imports made by server.py to list")
+    args = parser.parse_args()
+
+    # The first run compiles bytecode and warms the page cache
+    import_server()
+    process_ms, import_ms, entries = [], [], []
+    for _ in range(args.runs):
+        elapsed_ms, entries = import_server()
+        process_ms.append(elapsed_ms)
+        import_ms.append(next(cumulative for _, module, _, cumulative in entries if module == "server") / 1000)
+
+    # Children are printed before their parent, so server's direct imports are
+    # the depth-1 lines between the previous top-level import and server itself
+    server_index = next(index for index, entry in enumerate(entries) if entry[1] == "server")
+    first_child = server_index
+    while first_child > 0 and entries[first_child - 1][0] > 0:
+        first_child -= 1
+    direct = sorted((entry for entry in entries[first_child:server_index] if entry[0] == 1),
+                    key=lambda entry: entry[3], reverse=True)
+    eager = sorted({
+        module for _, module, _, _ in entries
+        if any(module == lazy or module.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    })
+    median_import_ms = statistics.median(import_ms)
+    report = {
+        "python": sys.version.split()[0],
+        "runs": args.runs,
+        "budget_ms": args.budget_ms,
+        "median_import_ms": round(median_import_ms, 1),
+        "median_process_ms": round(statistics.median(process_ms), 1),
+        "slowest_imports_ms": {module: round(cumulative / 1000, 1) for _, module, _, cumulative in direct[:args.top]},
+        "eager_lazy_modules": eager,
+        "passed": median_import_ms <= args.budget_ms and not eager,
+    }
+    print(json.dumps(report, indent=2))
+    if median_import_ms > args.budget_ms:
+        print(f"Startup regression: server imports in {median_import_ms:.0f} ms, budget is {args.budget_ms:.0f} ms",
+              file=sys.stderr)
+    if eager:
+        print(f"Modules meant to load lazily were imported at startup: {', '.join(eager)}", file=sys.stderr)
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
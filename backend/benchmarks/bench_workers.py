@@ -0,0 +1,146 @@
+"""Throughput scaling of the gunicorn multi-worker mode on one machine.
+
+Seeds one user with a budget and a month of expenses, then for each worker
+count starts `gunicorn server:app -c gunicorn.conf.py` with
+WEB_CONCURRENCY=N and drives GET /api/expenses/{m}/{y} from several client
+processes for a fixed duration. The route validates and serializes a few
+hundred rows per request, so it is bound by Python CPU rather than by
+MongoDB, which is what extra workers should scale. Prints requests/s per
+worker count and the scaling efficiency relative to one worker as JSON.
+
+Usage (from backend/, against a local MongoDB; needs more cores than the
+largest worker count plus client processes for a fair reading):
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.bench_workers --workers 1 2 4
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'smartsave_bench')
+os.environ.setdefault('JWT_SECRET', 'bench-secret')
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+
+import httpx  # noqa: E402
+
+import server  # noqa: E402
+
+ROWS = 300
+
+
+async def seed(month: int, year: int) -> tuple:
+    server.connect_db()
+    await server.ensure_indexes()
+    user_id = str(uuid.uuid4())
+    await server.db.budgets.insert_one(server.budget_document(server.MonthlyBudget(
+        user_id=user_id, month=str(month), year=year,
+        income_sources=[server.IncomeSource(name="Job", amount=2000.0)], total_income=2000.0
+    )))
+    first_day = datetime(year, month, 1, tzinfo=timezone.utc)
+    await server.db.expenses.insert_many([
+        server.expense_document(server.Expense(
+            user_id=user_id, amount=1.0 + i % 50, category="Food",
+            date=(first_day + timedelta(days=i % 28)).date().isoformat()
+        ))
+        for i in range(ROWS)
+    ])
+    return user_id, server.create_token(user_id)
+
+
+async def hammer(url: str, token: str, duration: float, concurrency: int) -> int:
+    completed = 0
+    deadline = time.perf_counter() + duration
+    headers = {"Authorization": f"Bearer {token}"}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers=headers, limits=limits, timeout=30) as http:
+        async def worker():
+            nonlocal completed
+            while time.perf_counter() < deadline:
+                response = await http.get(url)
+                if response.status_code == 200:
+                    completed += 1
+
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+    return completed
+
+
+def client_process(args: tuple) -> int:
+    return asyncio.run(hammer(*args))
+
+
+def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+def measure(workers: int, args, path: str, token: str) -> float:
+    base_url = f"http://127.0.0.1:{args.port}"
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{args.port}"}
+    server_process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "server:app", "-c", "gunicorn.conf.py"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(base_url)
+        with multiprocessing.Pool(args.clients) as pool:
+            pool.map(client_process, [(base_url + path, token, 1.0, args.concurrency)] * args.clients)
+            completed = pool.map(client_process, [(base_url + path, token, args.duration, args.concurrency)] * args.clients)
+        return sum(completed) / args.duration
+    finally:
+        server_process.terminate()
+        server_process.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-worker throughput scaling")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--clients', type=int, default=max(2, (os.cpu_count() or 2) // 2),
+                        help="load generator processes")
+    parser.add_argument('--concurrency', type=int, default=16, help="in-flight requests per client process")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds per measurement")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    today = datetime.now(timezone.utc)
+    _, token = asyncio.run(seed(today.month, today.year))
+    server.close_db()
+    path = f"/api/expenses/{today.month}/{today.year}"
+
+    results = {}
+    for workers in args.workers:
+        results[workers] = measure(workers, args, path, token)
+        print(f"{workers} workers: {results[workers]:.0f} req/s", file=sys.stderr)
+
+    baseline = results[args.workers[0]] / args.workers[0]
+    report = {
+        "cpu_count": os.cpu_count(),
+        "config": vars(args),
+        "rows_per_response": ROWS,
+        "workers": {
+            str(workers): {
+                "throughput_rps": round(rps, 1),
+                "efficiency": round(rps / (workers * baseline), 2) if baseline else 0.0,
+            }
+            for workers, rps in results.items()
+        },
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""In-process load test for the SmartSaveAI API.
+
+Runs the FastAPI app in-process over httpx's ASGI transport against a local
+MongoDB with the LLM call stubbed out. It seeds a configurable number of
+users, each with a budget, expenses spread over past months and goals. Then it drives concurrent authenticated
+traffic at each endpoint in turn and prints one JSON report with
+throughput and p50/p95/p99 latency per endpoint, so runs can be diffed
+across commits.
+
+Usage (from backend/):
+    MONGO_URL=mongodb://localhost:27017 python -m benchmarks.load_test --db smartsave_loadtest \\
+        --users 20 --expenses 2000 --concurrency 32 --requests 500 --output bench.json
+
+The database named by --db is dropped before and after the run. DB_NAME from
+the environment is ignored, and a database that already holds collections
+is only dropped when --reset is given.
+
+A real mongod is required: the routes rely on Decimal128 codecs, pipeline
+updates and aggregation stages that in-memory fakes do not implement.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('EMERGENT_LLM_KEY', 'load-test-stub')
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+
+import httpx  # noqa: E402
+
+import server  # noqa: E402
+
+CATEGORIES = ["Food", "Transport", "Rent", "Fun", "Shopping", "Other"]
+
+
+async def stub_llm_advice(prompt: str) -> str:
+    await asyncio.sleep(0.05)
+    return "Stub advice: keep it tight."
+
+
+async def seed(args) -> list:
+    """Create users with budgets, expenses and goals; return (user_id, token, goal_ids)."""
+    today = datetime.now(timezone.utc)
+    users = []
+    for _ in range(args.users):
+        user_id = str(uuid.uuid4())
+        budget = server.MonthlyBudget(
+            user_id=user_id,
+            month=str(today.month),
+            year=today.year,
+            income_sources=[server.IncomeSource(name="Job", amount=1500.0)],
+            total_income=1500.0
+        )
+        await server.db.budgets.insert_one(server.budget_document(budget))
+
+        expenses = []
+        for _ in range(args.expenses):
+            day = today - timedelta(days=random.randrange(args.months * 30))
+            expenses.append(server.expense_document(server.Expense(
+                user_id=user_id,
+                amount=round(random.uniform(1, 80), 2),
+                category=random.choice(CATEGORIES),
+                date=day.date().isoformat()
+            )))
+        for start in range(0, len(expenses), 5000):
+            await server.db.expenses.insert_many(expenses[start:start + 5000], ordered=False)
+
+        goal_ids = []
+        for index in range(args.goals):
+            goal = server.Goal(user_id=user_id, name=f"Goal {index}", icon="x", target_amount=1e9)
+            await server.db.goals.insert_one(server.goal_money_fields(goal.model_dump()))
+            goal_ids.append(goal.id)
+
+        users.append((user_id, server.create_token(user_id), goal_ids))
+    await server.rebuild_rollups()
+    return users
+
+
+def scenarios(today: datetime) -> dict:
+    month, year = today.month, today.year
+    advice = {
+        "money_left": 700.0, "days_left": 12, "burn_rate": 35.0, "safe_daily_spend": 58.0,
+        "expenses": [{"category": "Food", "amount": 300.0}, {"category": "Fun", "amount": 500.0}],
+        "total_income": 1500.0, "total_spent": 800.0,
+    }
+    expense = {"amount": 4.2, "category": "Food", "note": "load test", "date": today.date().isoformat()}
+    return {
+        "get_budget": lambda user: ("GET", f"/api/budget/{month}/{year}", None),
+        "get_expenses": lambda user: ("GET", f"/api/expenses/{month}/{year}", None),
+        "get_expenses_fast": lambda user: ("GET", f"/api/expenses/{month}/{year}?fast=true", None),
+        "get_stats": lambda user: ("GET", f"/api/stats/{month}/{year}", None),
+        "get_summary": lambda user: ("GET", f"/api/summary/{month}/{year}", None),
+        "get_dashboard": lambda user: ("GET", f"/api/dashboard/{month}/{year}", None),
+        "get_goals": lambda user: ("GET", "/api/goals", None),
+        "create_expense": lambda user: ("POST", "/api/expenses", expense),
+        "add_money": lambda user: ("POST", f"/api/goals/{random.choice(user[2])}/add-money", {"amount": 1.0})
+        if user[2] else ("GET", "/api/goals", None),
+        "ai_advice": lambda user: ("POST", "/api/ai-advice", advice),
+    }
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def drive(http: httpx.AsyncClient, users: list, build, total: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            user = random.choice(users)
+            method, path, body = build(user)
+            started = time.perf_counter()
+            response = await http.request(
+                method, path, json=body, headers={"Authorization": f"Bearer {user[1]}"}
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="In-process load test for the SmartSaveAI API")
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--expenses', type=int, default=1000, help="expenses per user")
+    parser.add_argument('--months', type=int, default=12, help="months of history to spread expenses over")
+    parser.add_argument('--goals', type=int, default=3, help="goals per user")
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=300, help="requests per endpoint")
+    parser.add_argument('--endpoints', nargs='*', help="subset of endpoints to run")
+    parser.add_argument('--db', required=True, help="scratch database to seed and drop")
+    parser.add_argument('--reset', action='store_true', help="allow dropping --db even if it already has data")
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    os.environ['DB_NAME'] = args.db
+    server.connect_db()
+    server.request_llm_advice = stub_llm_advice
+
+    if await server.db.list_collection_names() and not args.reset:
+        sys.exit(f"Database {args.db!r} is not empty; pass --reset to drop it, or pick a scratch database")
+    await server.client.drop_database(args.db)
+    await server.ensure_indexes()
+    seed_started = time.perf_counter()
+    users = await seed(args)
+    seed_seconds = time.perf_counter() - seed_started
+
+    today = datetime.now(timezone.utc)
+    results = {}
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=60) as http:
+        for name, build in scenarios(today).items():
+            if args.endpoints and name not in args.endpoints:
+                continue
+            results[name] = await drive(http, users, build, args.requests, args.concurrency)
+            print(f"{name}: {results[name]}", file=sys.stderr)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": today.isoformat(),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key != 'output'},
+        "seed_seconds": round(seed_seconds, 2),
+        "endpoints": results,
+    }
+    await server.client.drop_database(args.db)
+    server.client.close()
+
+    rendered = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(rendered + "\n")
+    else:
+        print(rendered)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
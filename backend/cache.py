@@ -0,0 +1,147 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, expires_at: Optional[float] = None):
+        expiry = time.time() + (self.ttl if ttl is None else ttl)
+        if expires_at is not None:
+            expiry = min(expiry, expires_at)
+        self._data[key] = (value, expiry)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class MemoryCache:
+    """Async response cache backed by an in-process TTLCache."""
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        self._cache.set(key, value, ttl=ttl)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._cache.delete(key)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self._cache.stats()}
+
+
+class RedisCache:
+    """Async response cache backed by a Redis-compatible server."""
+
+    def __init__(self, url: str, ttl: float = 300.0, prefix: str = "smartsave:"):
+        import redis.asyncio as redis_asyncio
+
+        self._redis = redis_asyncio.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        value = await self._redis.get(self.prefix + key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        await self._redis.set(self.prefix + key, value, px=int((self.ttl if ttl is None else ttl) * 1000))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._redis.delete(*(self.prefix + key for key in keys))
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "hits": self.hits, "misses": self.misses}
+
+
+class MongoCache:
+    """Async cache stored in a MongoDB collection, so every worker sees the same entries.
+
+    Reads ignore expired entries; a TTL index on expires_at (see
+    server.INDEXES) removes them in the background.
+    """
+
+    def __init__(self, collection, ttl: float = 300.0, prefix: str = ""):
+        self._collection = collection
+        self.ttl = ttl
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[str]:
+        doc = await self._collection.find_one(
+            {"_id": self.prefix + key, "expires_at": {"$gt": datetime.now(timezone.utc)}}, {"value": 1}
+        )
+        if doc is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return doc['value']
+
+    async def set(self, key: str, value: str, ttl: Optional[float] = None):
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl if ttl is None else ttl)
+        await self._collection.update_one(
+            {"_id": self.prefix + key}, {"$set": {"value": value, "expires_at": expires_at}}, upsert=True
+        )
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._collection.delete_many({"_id": {"$in": [self.prefix + key for key in keys]}})
+
+    def stats(self) -> dict:
+        return {"backend": "mongo", "hits": self.hits, "misses": self.misses}
+
+
+def create_shared_cache(url: Optional[str] = None, collection=None, maxsize: int = 10000,
+                        ttl: float = 300.0, prefix: str = ""):
+    """Pick a cache backend: Redis when a URL is configured, a Mongo collection
+    when one is given (several workers, no Redis), otherwise in-process memory."""
+    if url:
+        return RedisCache(url, ttl=ttl, prefix="smartsave:" + prefix)
+    if collection is not None:
+        return MongoCache(collection, ttl=ttl, prefix=prefix)
+    return MemoryCache(maxsize=maxsize, ttl=ttl)
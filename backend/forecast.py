@@ -0,0 +1,135 @@
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Two-sided 80% band under a normal approximation
+Z_80 = 1.2815515655446004
+# ETAs further out than this are reported as unreachable rather than as dates
+MAX_HORIZON_DAYS = 36500
+
+
+def daily_spend_tensor(rows: Iterable[Tuple[str, str, date, float]], user_index: Dict[str, int],
+                       category_index: Dict[str, int], start: date, days: int) -> np.ndarray:
+    """Scatter (user_id, category, day, amount) rows into a (users, categories, days) array."""
+    rows = [row for row in rows if 0 <= (row[2] - start).days < days]
+    tensor = np.zeros((len(user_index), len(category_index), days))
+    if rows:
+        users = np.fromiter((user_index[row[0]] for row in rows), dtype=np.intp, count=len(rows))
+        categories = np.fromiter((category_index[row[1]] for row in rows), dtype=np.intp, count=len(rows))
+        offsets = np.fromiter(((row[2] - start).days for row in rows), dtype=np.intp, count=len(rows))
+        amounts = np.fromiter((row[3] for row in rows), dtype=float, count=len(rows))
+        np.add.at(tensor, (users, categories, offsets), amounts)
+    return tensor
+
+
+def project_spending(tensor: np.ndarray, income: np.ndarray, month_offset: int, as_of: int,
+                     z: float = Z_80) -> Dict[str, np.ndarray]:
+    """Project end-of-month spending and balance for every user at once.
+
+    `tensor` is daily spend shaped (users, categories, days); the month runs
+    from `month_offset` to the last day, and `as_of` is the index of the last
+    observed day. Each category's daily spend is treated as independent draws
+    with the mean and variance seen from the user's first active day up to
+    `as_of`, so a remaining-days total has mean R*mu and variance R*sigma^2.
+    """
+    users, _, days = tensor.shape
+    day_index = np.arange(days)
+    observed = tensor[:, :, :as_of + 1]
+
+    active = observed.sum(axis=1) > 0
+    first_active = np.where(active.any(axis=1), active.argmax(axis=1), as_of)
+    mask = day_index[:as_of + 1][None, :] >= first_active[:, None]
+    observed_days = mask.sum(axis=1).astype(float)
+
+    history = observed * mask[:, None, :]
+    mean = history.sum(axis=2) / observed_days[:, None]
+    variance = np.maximum((history ** 2).sum(axis=2) / observed_days[:, None] - mean ** 2, 0.0)
+
+    remaining_days = days - max(as_of + 1, month_offset)
+    spent = tensor[:, :, month_offset:].sum(axis=2)
+    projected = spent + remaining_days * mean
+    spread = z * np.sqrt(remaining_days * variance)
+
+    spent_total = spent.sum(axis=1)
+    projected_total = projected.sum(axis=1)
+    spread_total = z * np.sqrt(remaining_days * variance.sum(axis=1))
+    low_total = np.maximum(projected_total - spread_total, spent_total)
+    high_total = projected_total + spread_total
+
+    return {
+        "remaining_days": np.full(users, remaining_days),
+        "daily_mean": mean,
+        "spent": spent,
+        "projected": projected,
+        "low": np.maximum(projected - spread, spent),
+        "high": projected + spread,
+        "spent_total": spent_total,
+        "projected_total": projected_total,
+        "balance": income - projected_total,
+        "balance_low": income - high_total,
+        "balance_high": income - low_total,
+    }
+
+
+def project_goals(contributions: np.ndarray, first_day: np.ndarray, remaining: np.ndarray,
+                  days_to_deadline: np.ndarray, z: float = Z_80) -> Dict[str, np.ndarray]:
+    """Estimate days until each goal is funded from its daily contribution history.
+
+    `contributions` is (goals, days) ending today; `first_day` is the index
+    each goal started being tracked. The band comes from the standard error
+    of the mean daily contribution. `days_to_deadline` is NaN for goals
+    without a deadline; unreachable estimates, or ones past MAX_HORIZON_DAYS,
+    come back as inf.
+    """
+    goals, days = contributions.shape
+    day_index = np.arange(days)
+    mask = day_index[None, :] >= first_day[:, None]
+    observed_days = np.maximum(mask.sum(axis=1), 1).astype(float)
+
+    history = contributions * mask
+    rate = history.sum(axis=1) / observed_days
+    variance = np.maximum((history ** 2).sum(axis=1) / observed_days - rate ** 2, 0.0)
+    error = z * np.sqrt(variance / observed_days)
+    fast_rate = rate + error
+    slow_rate = np.maximum(rate - error, 0.0)
+
+    def days_needed(daily_rate: np.ndarray) -> np.ndarray:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            needed = np.where(daily_rate > 0, np.ceil(remaining / daily_rate), np.inf)
+        needed = np.where(needed > MAX_HORIZON_DAYS, np.inf, needed)
+        return np.where(remaining <= 0, 0.0, needed)
+
+    eta = days_needed(rate)
+    with np.errstate(invalid='ignore'):
+        required_rate = np.where(np.isnan(days_to_deadline), np.nan, remaining / np.maximum(days_to_deadline, 1))
+        on_track = eta <= days_to_deadline
+
+    return {
+        "daily_rate": rate,
+        "eta_days": eta,
+        "earliest_days": days_needed(fast_rate),
+        "latest_days": days_needed(slow_rate),
+        "required_daily_rate": required_rate,
+        "on_track": on_track,
+    }
+
+
+def finite_or_none(value: float):
+    return None if not np.isfinite(value) else float(value)
+
+
+def category_bands(categories: List[str], projection: Dict[str, np.ndarray], user: int) -> List[dict]:
+    """Per-category rows for one user, skipping categories the user never spent in."""
+    bands = []
+    for index, category in enumerate(categories):
+        if projection['projected'][user, index] == 0 and projection['daily_mean'][user, index] == 0:
+            continue
+        bands.append({
+            "category": category,
+            "spent": round(float(projection['spent'][user, index]), 2),
+            "projected": round(float(projection['projected'][user, index]), 2),
+            "low": round(float(projection['low'][user, index]), 2),
+            "high": round(float(projection['high'][user, index]), 2),
+        })
+    return sorted(bands, key=lambda band: band['projected'], reverse=True)
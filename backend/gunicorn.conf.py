@@ -0,0 +1,31 @@
+"""Gunicorn settings for serving the API from several worker processes.
+
+Usage (from backend/):
+    WEB_CONCURRENCY=4 JWT_SECRET=... gunicorn server:app -c gunicorn.conf.py
+
+The app is imported once in the master and forked; each worker then opens
+its own Motor client in the FastAPI lifespan. With WEB_CONCURRENCY > 1,
+response and advice caches move to CACHE_REDIS_URL, or to the
+cache_entries collection when no Redis is configured. Rate-of-work limits such
+as LLM_CONCURRENCY, BCRYPT_WORKERS and MONGO_MAX_POOL_SIZE apply per worker.
+
+/metrics is per-process state and a scrape reaches whichever worker accepts
+it, so every sample carries a worker="<pid>" label. Sum across that label
+in queries (e.g. sum without (worker) (rate(...))) rather than reading a
+single series, which only covers one worker and restarts with it.
+
+Behind a reverse proxy or ingress, set RATE_LIMIT_TRUSTED_PROXIES to the
+proxies' addresses or CIDRs (e.g. 10.0.0.0/8) so login and register limits
+are keyed on the client from X-Forwarded-For / Forwarded instead of on the
+proxy, which would put every user in one bucket.
+"""
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8001')
+workers = int(os.environ.get('WEB_CONCURRENCY', '1'))
+worker_class = 'uvicorn.workers.UvicornWorker'
+preload_app = True
+keepalive = int(os.environ.get('KEEPALIVE', '5'))
+timeout = int(os.environ.get('WORKER_TIMEOUT', '60'))
+graceful_timeout = int(os.environ.get('GRACEFUL_TIMEOUT', '30'))
+accesslog = os.environ.get('ACCESS_LOG')
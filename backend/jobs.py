@@ -0,0 +1,211 @@
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryJobBackend:
+    """A bounded in-process queue; jobs still queued when the process dies are lost."""
+
+    durable = False
+
+    def __init__(self, maxsize: int = 1000):
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=maxsize)
+
+    async def put(self, job: dict) -> bool:
+        try:
+            self.queue.put_nowait(job)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    async def done(self, job: dict):
+        self.queue.task_done()
+
+    async def fail(self, job: dict, error: str):
+        self.queue.task_done()
+
+    async def join(self):
+        await self.queue.join()
+
+    def qsize(self) -> Optional[int]:
+        return self.queue.qsize()
+
+
+class MongoJobBackend:
+    """Jobs stored in a collection, so they survive restarts and any process can run them.
+
+    A claimed job is leased; if its worker dies before finishing, the lease
+    runs out and another worker claims it again. Finished jobs are deleted,
+    failed ones are kept with their error until a TTL index drops them.
+    """
+
+    durable = True
+
+    def __init__(self, collection, maxsize: int = 100000, lease: float = 300.0, poll_interval: float = 0.5):
+        self.collection = collection
+        self.maxsize = maxsize
+        self.lease = lease
+        self.poll_interval = poll_interval
+
+    async def put(self, job: dict) -> bool:
+        if await self.collection.count_documents({"status": "queued"}, limit=self.maxsize) >= self.maxsize:
+            return False
+        await self.collection.insert_one({**job, "status": "queued"})
+        return True
+
+    async def get(self) -> dict:
+        while True:
+            now = datetime.now(timezone.utc)
+            job = await self.collection.find_one_and_update(
+                {"$or": [{"status": "queued"}, {"status": "running", "lease_until": {"$lt": now}}]},
+                {"$set": {"status": "running", "lease_until": now + timedelta(seconds=self.lease)}},
+                projection={"_id": 0, "id": 1, "name": 1, "payload": 1},
+                sort=[("created_at", 1)],
+                return_document=ReturnDocument.AFTER
+            )
+            if job:
+                return job
+            await asyncio.sleep(self.poll_interval)
+
+    async def done(self, job: dict):
+        await self.collection.delete_one({"id": job['id']})
+
+    async def fail(self, job: dict, error: str):
+        await self.collection.update_one({"id": job['id']}, {"$set": {
+            "status": "failed", "error": error, "finished_at": datetime.now(timezone.utc)
+        }})
+
+    async def join(self):
+        # Queued jobs stay in the collection for the next worker to start
+        return
+
+    def qsize(self) -> Optional[int]:
+        return None
+
+
+class JobRunner:
+    """Runs named jobs from a backend on a fixed number of tasks.
+
+    Handlers are registered by name and receive the job payload as keyword
+    arguments, so payloads must be BSON-serializable for MongoJobBackend. A
+    failing job is retried with exponential backoff up to max_attempts;
+    handlers must therefore be safe to run more than once.
+    """
+
+    def __init__(self, backend, concurrency: int = 2, max_attempts: int = 3, retry_delay: float = 0.5):
+        self.backend = backend
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.handlers: Dict[str, Callable[..., Awaitable[None]]] = {}
+        self.running = 0
+        self.enqueued = 0
+        self.rejected = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+
+    def handler(self, name: str):
+        def register(func):
+            self.handlers[name] = func
+            return func
+        return register
+
+    def start(self):
+        self._stopping = False
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._work()) for _ in range(self.concurrency)]
+
+    async def enqueue(self, name: str, **payload) -> bool:
+        """Queue a job; returns False when the queue is full or nothing would run it."""
+        # A durable backend is accepted even without local workers: another
+        # process may be the one running the jobs
+        if self._stopping or not (self._tasks or self.backend.durable):
+            self.rejected += 1
+            return False
+        job = {"id": str(uuid.uuid4()), "name": name, "payload": payload, "created_at": datetime.now(timezone.utc)}
+        if not await self.backend.put(job):
+            self.rejected += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    async def defer(self, name: str, **payload):
+        """Queue a job, or run it right away when the queue cannot take it."""
+        if not await self.enqueue(name, **payload):
+            await self.handlers[name](**payload)
+
+    async def _run(self, job: dict):
+        handler = self.handlers[job['name']]
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await handler(**job['payload'])
+                return
+            except Exception:
+                if attempt == self.max_attempts:
+                    raise
+                self.retried += 1
+                logger.warning(f"Job {job['name']} {job['id']} failed on attempt {attempt}, retrying", exc_info=True)
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+    async def _work(self):
+        # In-memory jobs are drained on shutdown; durable ones are left queued
+        while not (self._stopping and self.backend.durable):
+            job = await self.backend.get()
+            self.running += 1
+            try:
+                await self._run(job)
+            except Exception as e:
+                self.failed += 1
+                logger.exception(f"Job {job['name']} {job['id']} failed")
+                outcome = self.backend.fail(job, repr(e))
+            else:
+                self.completed += 1
+                outcome = self.backend.done(job)
+            try:
+                await outcome
+            except Exception:
+                logger.exception(f"Could not record the outcome of job {job['id']}")
+            finally:
+                self.running -= 1
+
+    async def _drain(self):
+        await self.backend.join()
+        while self.running:
+            await asyncio.sleep(0.05)
+
+    async def stop(self, timeout: float = 10.0):
+        """Stop accepting jobs, give queued and running ones `timeout` seconds, then cancel."""
+        self._stopping = True
+        try:
+            await asyncio.wait_for(self._drain(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Jobs still pending after {timeout}s, cancelling {self.running} running")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {
+            "backend": "mongo" if self.backend.durable else "memory",
+            "queued": self.backend.qsize(),
+            "workers": len(self._tasks),
+            "running": self.running,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+        }
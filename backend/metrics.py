@@ -0,0 +1,194 @@
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def format_labels(names: Sequence[str], values: Tuple[str, ...], extra: Optional[Dict[str, str]] = None) -> str:
+    pairs = list(zip(names, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.const_labels: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labels)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            lines.extend(self._samples())
+        return "\n".join(lines)
+
+    def _samples(self):
+        return []
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self):
+        for key, value in self._values.items():
+            yield f"{self.name}{format_labels(self.labels, key, self.const_labels)} {value}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _samples(self):
+        for key, (counts, total, count) in self._series.items():
+            for bound, bucket_count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket{format_labels(self.labels, key, {**self.const_labels, 'le': repr(bound)})} {bucket_count}"
+            yield f"{self.name}_bucket{format_labels(self.labels, key, {**self.const_labels, 'le': '+Inf'})} {count}"
+            yield f"{self.name}_sum{format_labels(self.labels, key, self.const_labels)} {total}"
+            yield f"{self.name}_count{format_labels(self.labels, key, self.const_labels)} {count}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def set_const_labels(self, **labels):
+        """Attach labels to every sample, e.g. the worker pid when several processes serve /metrics."""
+        for metric in self._metrics:
+            metric.const_labels = dict(labels)
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status")
+))
+mongo_command_duration = registry.register(Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency.", ("command", "outcome")
+))
+mongo_pool_checkout_wait = registry.register(Histogram(
+    "mongo_pool_checkout_wait_seconds", "Time spent waiting for a pooled MongoDB connection.", ("outcome",)
+))
+mongo_pool_checked_out = registry.register(Gauge(
+    "mongo_pool_connections_checked_out", "MongoDB connections currently checked out."
+))
+mongo_pool_connections = registry.register(Gauge(
+    "mongo_pool_connections_open", "MongoDB connections currently open."
+))
+llm_call_duration = registry.register(Histogram(
+    "llm_call_duration_seconds", "Upstream LLM call latency.", ("outcome",)
+))
+
+
+class CommandTimer(monitoring.CommandListener):
+    """Feeds pymongo command monitoring events into mongo_command_duration."""
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        mongo_command_duration.observe(event.duration_micros / 1e6, command=event.command_name, outcome="ok")
+
+    def failed(self, event):
+        mongo_command_duration.observe(event.duration_micros / 1e6, command=event.command_name, outcome="error")
+
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Tracks pool checkout waits and connection counts.
+
+    pymongo emits the checkout events on the thread doing the checkout, so
+    the start time is kept in a thread-local.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def _observe_wait(self, outcome: str):
+        started = getattr(self._local, "checkout_started", None)
+        if started is not None:
+            mongo_pool_checkout_wait.observe(time.perf_counter() - started, outcome=outcome)
+            self._local.checkout_started = None
+
+    def connection_check_out_started(self, event):
+        self._local.checkout_started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        self._observe_wait("ok")
+        mongo_pool_checked_out.inc()
+
+    def connection_check_out_failed(self, event):
+        self._observe_wait(str(event.reason))
+
+    def connection_checked_in(self, event):
+        mongo_pool_checked_out.dec()
+
+    def connection_created(self, event):
+        mongo_pool_connections.inc()
+
+    def connection_closed(self, event):
+        mongo_pool_connections.dec()
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
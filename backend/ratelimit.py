@@ -0,0 +1,112 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def parse_budget(value: str) -> Tuple[float, float]:
+    """Parse "<requests>/<seconds>" into (capacity, tokens refilled per second)."""
+    requests, seconds = value.split('/', 1)
+    capacity = float(requests)
+    return capacity, capacity / float(seconds)
+
+
+class MemoryRateLimiter:
+    """Token buckets held in-process, dropping the least recently used keys past maxsize.
+
+    Each worker process keeps its own buckets, so with several workers a
+    client can get up to workers x capacity; use RedisRateLimiter there.
+    """
+
+    def __init__(self, maxsize: int = 100000):
+        self.maxsize = maxsize
+        self.allowed = 0
+        self.limited = 0
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+
+    async def acquire(self, key: str, capacity: float, refill_rate: float) -> float:
+        """Take one token; return 0 when allowed, else the seconds until one is available."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        tokens = capacity if bucket is None else min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+        if tokens >= 1:
+            tokens -= 1
+            wait = 0.0
+            self.allowed += 1
+        else:
+            wait = (1 - tokens) / refill_rate
+            self.limited += 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return wait
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "keys": len(self._buckets), "allowed": self.allowed, "limited": self.limited}
+
+
+# Refill, take and store in one atomic step, using the server clock so every
+# worker agrees on elapsed time
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000))
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter:
+    """Token buckets shared by every worker through a Redis-compatible server.
+
+    If Redis is unreachable requests are let through, so an outage of the
+    limiter never takes the API down with it.
+    """
+
+    def __init__(self, url: str, prefix: str = "smartsave:ratelimit:"):
+        import redis.asyncio as redis_asyncio
+
+        self._redis = redis_asyncio.from_url(url)
+        self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+        self.prefix = prefix
+        self.allowed = 0
+        self.limited = 0
+        self.errors = 0
+
+    async def acquire(self, key: str, capacity: float, refill_rate: float) -> float:
+        try:
+            wait = float(await self._script(keys=[self.prefix + key], args=[capacity, refill_rate]))
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Rate limiter unavailable, allowing request: {e!r}")
+            return 0.0
+        if wait > 0:
+            self.limited += 1
+        else:
+            self.allowed += 1
+        return wait
+
+    def stats(self) -> dict:
+        return {"backend": "redis", "allowed": self.allowed, "limited": self.limited, "errors": self.errors}
+
+
+def create_rate_limiter(url: Optional[str] = None, maxsize: int = 100000):
+    """Return a RedisRateLimiter when a URL is configured, otherwise a MemoryRateLimiter."""
+    if url:
+        return RedisRateLimiter(url)
+    return MemoryRateLimiter(maxsize=maxsize)
@@ -0,0 +1,187 @@
+import csv
+import io
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, List
+
+MEDIA_TYPES = {"csv": "text/csv", "pdf": "application/pdf"}
+CSV_COLUMNS = ["date", "category", "note", "amount"]
+CSV_FLUSH_ROWS = 500
+
+
+def csv_cell(value: str) -> str:
+    # Keep spreadsheet apps from evaluating user-entered notes as formulas
+    if value and value[0] in "=+-@\t\r":
+        return "'" + value
+    return value
+
+
+async def render_csv(rows: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    """Encode expense rows as CSV, yielding a chunk every CSV_FLUSH_ROWS rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    count = 0
+    async for row in rows:
+        writer.writerow([row['date'], csv_cell(row['category']), csv_cell(row.get('note') or ""), f"{row['amount']:.2f}"])
+        count += 1
+        if count % CSV_FLUSH_ROWS == 0:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate(0)
+    yield buffer.getvalue().encode('utf-8')
+
+
+# A4 in points
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+MARGIN = 50
+LINE_HEIGHT = 16
+ACCENT = (124, 58, 237)
+MUTED = (100, 100, 100)
+
+
+def pdf_string(value: str) -> str:
+    # The standard Helvetica font uses WinAnsiEncoding, i.e. cp1252 (which has €)
+    text = value.encode('cp1252', errors='replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+class PdfWriter:
+    """Writes a text-only PDF incrementally.
+
+    Each page is emitted as soon as it is full, so memory stays flat no matter
+    how many rows a report has; only the byte offset of every object is kept
+    for the cross-reference table at the end.
+    """
+
+    CATALOG, PAGES, FONT, BOLD_FONT = 1, 2, 3, 4
+
+    def __init__(self):
+        self.offset = 0
+        self.offsets: Dict[int, int] = {}
+        self.page_ids: List[int] = []
+        self.next_id = 5
+        self.ops: List[str] = []
+        self.y = PAGE_HEIGHT - MARGIN
+
+    def _object(self, number: int, body: bytes) -> bytes:
+        data = f"{number} 0 obj\n".encode('latin-1') + body + b"\nendobj\n"
+        self.offsets[number] = self.offset
+        self.offset += len(data)
+        return data
+
+    def start(self) -> bytes:
+        header = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+        self.offset = len(header)
+        return header + b"".join([
+            self._object(self.FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"),
+            self._object(self.BOLD_FONT, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>"),
+        ])
+
+    def text(self, x: float, text: str, size: int = 10, bold: bool = False, color=(0, 0, 0)):
+        r, g, b = (channel / 255 for channel in color)
+        font = "F2" if bold else "F1"
+        self.ops.append(f"{r:.3f} {g:.3f} {b:.3f} rg BT /{font} {size} Tf {x} {self.y} Td ({pdf_string(text)}) Tj ET")
+
+    def advance(self, lines: float = 1):
+        self.y -= LINE_HEIGHT * lines
+
+    def has_room(self, lines: float = 1) -> bool:
+        return self.y - LINE_HEIGHT * lines >= MARGIN
+
+    def finish_page(self) -> bytes:
+        page_number = len(self.page_ids) + 1
+        self.ops.append(f"0.588 0.588 0.588 rg BT /F1 9 Tf {PAGE_WIDTH / 2 - 15} 30 Td (Page {page_number}) Tj ET")
+        content = "\n".join(self.ops).encode('latin-1')
+        content_id, page_id = self.next_id, self.next_id + 1
+        self.next_id += 2
+        self.page_ids.append(page_id)
+        self.ops = []
+        self.y = PAGE_HEIGHT - MARGIN
+        return self._object(content_id, f"<< /Length {len(content)} >>\nstream\n".encode('latin-1') + content + b"\nendstream") + \
+            self._object(page_id, (
+                f"<< /Type /Page /Parent {self.PAGES} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 {self.FONT} 0 R /F2 {self.BOLD_FONT} 0 R >> >> /Contents {content_id} 0 R >>"
+            ).encode('latin-1'))
+
+    def close(self) -> bytes:
+        data = b""
+        if self.ops or not self.page_ids:
+            data += self.finish_page()
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        data += self._object(self.PAGES, f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode('latin-1'))
+        data += self._object(self.CATALOG, f"<< /Type /Catalog /Pages {self.PAGES} 0 R >>".encode('latin-1'))
+        xref_offset = self.offset
+        entries = [f"xref\n0 {self.next_id}\n", "0000000000 65535 f \n"]
+        entries.extend(f"{self.offsets[number]:010d} 00000 n \n" for number in range(1, self.next_id))
+        entries.append(f"trailer\n<< /Size {self.next_id} /Root {self.CATALOG} 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n")
+        return data + "".join(entries).encode('latin-1')
+
+
+def euros(amount: float) -> str:
+    return f"€{amount:,.2f}"
+
+
+async def render_pdf(rows: AsyncIterator[dict], summary: dict, start: str, end: str) -> AsyncIterator[bytes]:
+    """Lay out the summary and category breakdown, then every transaction in date order.
+
+    `summary` comes from an aggregation run before the row cursor is opened:
+    total, count, days (distinct days with spending) and categories
+    (category, total, count), largest first.
+    """
+    pdf = PdfWriter()
+    yield pdf.start()
+
+    pdf.text(MARGIN, "SmartSaveAI Report", size=20, bold=True, color=ACCENT)
+    pdf.advance(1.5)
+    pdf.text(MARGIN, f"Period: {start} to {end}", size=12, color=MUTED)
+    pdf.advance()
+    pdf.text(MARGIN, f"Generated: {datetime.now(timezone.utc).strftime('%b %d, %Y %H:%M')} UTC", size=12, color=MUTED)
+    pdf.advance(2)
+
+    total = summary['total']
+    pdf.text(MARGIN, "Summary", size=14, bold=True)
+    pdf.advance(1.25)
+    pdf.text(MARGIN, f"Total Expenses: {euros(total)}", size=11)
+    pdf.advance()
+    pdf.text(MARGIN, f"Number of Transactions: {summary['count']}", size=11)
+    pdf.advance()
+    pdf.text(MARGIN, f"Average Daily Spending: {euros(total / max(summary['days'], 1))}", size=11)
+    pdf.advance(2)
+
+    pdf.text(MARGIN, "Category Breakdown", size=14, bold=True)
+    pdf.advance(1.25)
+    for x, label in ((MARGIN, "Category"), (300, "Amount"), (450, "Percentage")):
+        pdf.text(x, label, bold=True, color=ACCENT)
+    pdf.advance()
+    for category in summary['categories']:
+        if not pdf.has_room():
+            yield pdf.finish_page()
+        share = category['total'] / total * 100 if total else 0.0
+        pdf.text(MARGIN, category['category'][:40])
+        pdf.text(300, euros(category['total']))
+        pdf.text(450, f"{share:.1f}%")
+        pdf.advance()
+    pdf.advance()
+
+    def table_header():
+        for x, label in ((MARGIN, "Date"), (130, "Category"), (260, "Note"), (470, "Amount")):
+            pdf.text(x, label, bold=True, color=ACCENT)
+        pdf.advance()
+
+    if not pdf.has_room(3):
+        yield pdf.finish_page()
+    pdf.text(MARGIN, "Transactions", size=14, bold=True)
+    pdf.advance(1.25)
+    table_header()
+    async for row in rows:
+        if not pdf.has_room():
+            yield pdf.finish_page()
+            table_header()
+        pdf.text(MARGIN, row['date'])
+        pdf.text(130, row['category'][:20])
+        pdf.text(260, (row.get('note') or "-")[:40])
+        pdf.text(470, euros(row['amount']))
+        pdf.advance()
+
+    yield pdf.close()
@@ -0,0 +1,52 @@
+"""Move transactions embedded in goal documents into goal_transactions.
+
+Each embedded transaction gets a deterministic id, so re-running after an
+interruption upserts the same rows instead of duplicating them.
+
+Usage (from backend/):
+    python -m scripts.migrate_goal_transactions
+"""
+import asyncio
+import uuid
+
+from pymongo import ReplaceOne
+
+import server
+
+
+async def main():
+    server.connect_db()
+    await server.ensure_indexes()
+    migrated_goals = 0
+    migrated_transactions = 0
+    async for goal in server.db.goals.find({"transactions": {"$exists": True}}, {"_id": 0}):
+        rows = [
+            {
+                "id": str(uuid.uuid5(uuid.NAMESPACE_URL, f"{goal['id']}/{index}")),
+                "user_id": goal['user_id'],
+                "goal_id": goal['id'],
+                "amount": server.to_decimal(transaction['amount']),
+                "date": server.as_datetime(transaction['date']),
+                "source": transaction.get('source', 'income'),
+            }
+            for index, transaction in enumerate(goal['transactions'])
+        ]
+        if rows:
+            await server.db.goal_transactions.bulk_write(
+                [ReplaceOne({"id": row['id']}, row, upsert=True) for row in rows], ordered=False
+            )
+        # $inc, not $set: add-money may already have counted contributions made
+        # since the deploy. Matching on the embedded array keeps a concurrent
+        # or repeated run from adding them twice.
+        await server.db.goals.update_one(
+            {"user_id": goal['user_id'], "id": goal['id'], "transactions": {"$exists": True}},
+            {"$inc": {"transaction_count": len(rows)}, "$unset": {"transactions": ""}}
+        )
+        migrated_goals += 1
+        migrated_transactions += len(rows)
+    print(f"Migrated {migrated_transactions} transactions from {migrated_goals} goals")
+    server.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
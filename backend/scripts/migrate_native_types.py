@@ -0,0 +1,137 @@
+"""Convert legacy documents to native BSON dates and Decimal128 money.
+
+Walks each collection in _id order in batches and rewrites only the
+fields still stored the old way (ISO strings for dates and timestamps,
+doubles/ints for money). Progress is checkpointed per collection in the
+`migrations` collection, so an interrupted run resumes where it stopped.
+Monthly rollups are rebuilt at the end so their totals are Decimal128 too.
+
+Usage (from backend/):
+    python -m scripts.migrate_native_types [--batch-size 1000] [--restart]
+"""
+import argparse
+import asyncio
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from pymongo import UpdateOne
+
+import server
+
+MIGRATION = "native_types"
+
+
+def convert_money(doc: dict, field: str, changes: dict, prefix: str = ""):
+    value = doc.get(field)
+    if value is not None and not isinstance(value, Decimal):
+        changes[prefix + field] = server.to_decimal(value)
+
+
+def convert_datetime(doc: dict, field: str, changes: dict):
+    value = doc.get(field)
+    if isinstance(value, str) and value:
+        changes[field] = server.as_datetime(value)
+
+
+def expense_changes(doc: dict) -> dict:
+    changes = {}
+    convert_money(doc, 'amount', changes)
+    convert_datetime(doc, 'date', changes)
+    convert_datetime(doc, 'created_at', changes)
+    return changes
+
+
+def budget_changes(doc: dict) -> dict:
+    changes = {}
+    convert_money(doc, 'total_income', changes)
+    for index, source in enumerate(doc.get('income_sources', [])):
+        convert_money(source, 'amount', changes, prefix=f"income_sources.{index}.")
+    convert_datetime(doc, 'created_at', changes)
+    return changes
+
+
+def goal_changes(doc: dict) -> dict:
+    changes = {}
+    convert_money(doc, 'target_amount', changes)
+    convert_money(doc, 'current_amount', changes)
+    convert_datetime(doc, 'created_at', changes)
+    convert_datetime(doc, 'completed_at', changes)
+    return changes
+
+
+def transaction_changes(doc: dict) -> dict:
+    changes = {}
+    convert_money(doc, 'amount', changes)
+    convert_datetime(doc, 'date', changes)
+    return changes
+
+
+def user_changes(doc: dict) -> dict:
+    changes = {}
+    convert_datetime(doc, 'created_at', changes)
+    return changes
+
+
+CONVERTERS = {
+    "users": user_changes,
+    "budgets": budget_changes,
+    "expenses": expense_changes,
+    "goals": goal_changes,
+    "goal_transactions": transaction_changes,
+}
+
+
+async def migrate_collection(name: str, convert, batch_size: int) -> int:
+    checkpoint_id = f"{MIGRATION}:{name}"
+    checkpoint = await server.db.migrations.find_one({"_id": checkpoint_id}) or {}
+    if checkpoint.get('done'):
+        print(f"{name}: already migrated")
+        return 0
+
+    last_id = checkpoint.get('last_id')
+    converted = 0
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        batch = await server.db[name].find(query).sort("_id", 1).limit(batch_size).to_list(None)
+        if not batch:
+            break
+        updates = []
+        for doc in batch:
+            changes = convert(doc)
+            if changes:
+                updates.append(UpdateOne({"_id": doc['_id']}, {"$set": changes}))
+        if updates:
+            await server.db[name].bulk_write(updates, ordered=False)
+        converted += len(updates)
+        last_id = batch[-1]['_id']
+        await server.db.migrations.update_one(
+            {"_id": checkpoint_id},
+            {"$set": {"last_id": last_id, "updated_at": datetime.now(timezone.utc)}},
+            upsert=True
+        )
+        print(f"{name}: {converted} converted so far")
+
+    await server.db.migrations.update_one({"_id": checkpoint_id}, {"$set": {"done": True}}, upsert=True)
+    return converted
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--restart', action='store_true', help="ignore saved checkpoints")
+    args = parser.parse_args()
+
+    server.connect_db()
+    if args.restart:
+        await server.db.migrations.delete_many({"_id": {"$regex": f"^{MIGRATION}:"}})
+    for name, convert in CONVERTERS.items():
+        converted = await migrate_collection(name, convert, args.batch_size)
+        print(f"{name}: converted {converted} documents")
+
+    rollups = await server.rebuild_rollups()
+    print(f"Rebuilt {rollups} monthly rollups")
+    server.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
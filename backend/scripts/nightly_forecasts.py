@@ -0,0 +1,63 @@
+"""Compute this month's forecast for every user and store it in `forecasts`.
+
+Users are processed in batches: each batch costs one expense aggregation,
+one budget query and one goal-transaction aggregation, and NumPy projects
+the whole batch at once.
+
+Usage (from backend/):
+    python -m scripts.nightly_forecasts [--batch-size 1000] [--month 6 --year 2024]
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
+import server
+
+
+async def store_batch(user_ids: list, month: str, year: int) -> int:
+    forecasts = await server.forecast_users(user_ids, month, year)
+    computed_at = datetime.now(timezone.utc)
+    updates = [
+        UpdateOne(
+            {"user_id": user_id, "year": year, "month": month},
+            {"$set": {**forecast.model_dump(), "user_id": user_id, "computed_at": computed_at}},
+            upsert=True
+        )
+        for user_id, forecast in forecasts.items()
+    ]
+    if updates:
+        await server.db.forecasts.bulk_write(updates, ordered=False)
+    return len(updates)
+
+
+async def main():
+    today = datetime.now(timezone.utc)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--month', default=str(today.month))
+    parser.add_argument('--year', type=int, default=today.year)
+    args = parser.parse_args()
+
+    server.connect_db()
+    await server.ensure_indexes()
+    started = time.perf_counter()
+    stored = 0
+    batch = []
+    async for user in server.db.users.find({}, {"_id": 0, "id": 1}).sort("id", 1):
+        batch.append(user['id'])
+        if len(batch) >= args.batch_size:
+            stored += await store_batch(batch, args.month, args.year)
+            batch = []
+            print(f"{stored} forecasts stored")
+    if batch:
+        stored += await store_batch(batch, args.month, args.year)
+
+    print(f"Stored {stored} forecasts in {time.perf_counter() - started:.1f}s")
+    server.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
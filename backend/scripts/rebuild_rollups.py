@@ -0,0 +1,25 @@
+"""Rebuild monthly_rollups from raw expenses, then the streaks derived from them.
+
+Usage (from backend/):
+    python -m scripts.rebuild_rollups            # every user
+    python -m scripts.rebuild_rollups <user_id>  # a single user
+"""
+import asyncio
+import sys
+
+import server
+
+
+async def main():
+    user_id = sys.argv[1] if len(sys.argv) > 1 else None
+    server.connect_db()
+    await server.ensure_indexes()
+    count = await server.rebuild_rollups(user_id)
+    print(f"Rebuilt {count} monthly rollups")
+    users = await server.rebuild_streaks(user_id)
+    print(f"Rebuilt streaks for {users} users")
+    server.client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
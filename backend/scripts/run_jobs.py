@@ -0,0 +1,45 @@
+"""Run queued background jobs in a process of their own.
+
+Start the API with JOB_BACKEND=mongo and JOB_WORKERS=0 so it only enqueues
+into the `jobs` collection, then run one or more of these beside it. On
+SIGINT/SIGTERM the worker stops claiming jobs, finishes the ones it is
+running and exits; anything still queued is picked up on the next start.
+
+Usage (from backend/):
+    python -m scripts.run_jobs [--concurrency 4]
+"""
+import argparse
+import asyncio
+import os
+import signal
+
+os.environ.setdefault('JOB_BACKEND', 'mongo')
+
+import server  # noqa: E402
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument('--concurrency', type=int, default=max(server.JOB_WORKERS, 1))
+    args = parser.parse_args()
+    if server.JOB_BACKEND != "mongo":
+        parser.error("a separate worker needs JOB_BACKEND=mongo")
+
+    server.connect_db()
+    await server.ensure_indexes()
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    server.jobs.concurrency = args.concurrency
+    server.jobs.start()
+    print(f"Running jobs on {args.concurrency} workers")
+    await stop.wait()
+    await server.jobs.stop(server.JOB_DRAIN_TIMEOUT)
+    print(f"Stopped: {server.jobs.stats()}")
+    server.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,33 +1,233 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from starlette.routing import Match
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ReturnDocument, UpdateOne
+from bson.codec_options import TypeCodec, TypeRegistry
+from bson.decimal128 import Decimal128
+from pymongo.errors import BulkWriteError, DuplicateKeyError, OperationFailure
+from gridfs.errors import NoFile
 import os
+import re
+import csv
+import json
+import math
+import asyncio
 import logging
+import time
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, ValidationError, field_validator
+from typing import Annotated, Dict, List, Optional
 import uuid
-from datetime import datetime, timezone, timedelta
-from emergentintegrations.llm.chat import LlmChat, UserMessage
+import hashlib
+import hmac
+import ipaddress
+import importlib
+from datetime import datetime, date, timezone, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 import jwt
 import bcrypt
+import orjson
+
+from advice import AdviceMemo, CircuitBreaker, GuardedLLM, advice_fingerprint, rule_based_advice
+from cache import TTLCache, create_shared_cache
+from jobs import JobRunner, MemoryJobBackend, MongoJobBackend
+from metrics import CommandTimer, PoolMonitor, http_request_duration, llm_call_duration, registry
+from ratelimit import create_rate_limiter, parse_budget
+from reports import MEDIA_TYPES, render_csv, render_pdf
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+class DecimalCodec(TypeCodec):
+    python_type = Decimal
+    bson_type = Decimal128
+
+    def transform_python(self, value):
+        return Decimal128(value)
+
+    def transform_bson(self, value):
+        return value.to_decimal()
+
+# Worker processes serving this app (gunicorn and uvicorn both read WEB_CONCURRENCY).
+# With more than one, in-process caches would go stale across workers, so
+# shared state moves to Redis or, failing that, to MongoDB.
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', '1'))
+
+# Per-process database handles. connect_db() opens them from the lifespan,
+# after the worker has forked; scripts and benchmarks call it directly.
+client: Optional[AsyncIOMotorClient] = None
+db = None
+report_files = None
+
+def connect_db():
+    global client, db, report_files, response_cache
+    if client is not None:
+        return
+    # tz_aware so BSON dates come back as UTC datetimes rather than naive ones;
+    # money is stored as Decimal128 and surfaces as decimal.Decimal
+    client = AsyncIOMotorClient(
+        os.environ['MONGO_URL'],
+        tz_aware=True,
+        type_registry=TypeRegistry([DecimalCodec()]),
+        maxPoolSize=int(os.environ.get('MONGO_MAX_POOL_SIZE', '100')),
+        minPoolSize=int(os.environ.get('MONGO_MIN_POOL_SIZE', '0')),
+        maxIdleTimeMS=int(os.environ.get('MONGO_MAX_IDLE_TIME_MS', '0')) or None,
+        waitQueueTimeoutMS=int(os.environ.get('MONGO_WAIT_QUEUE_TIMEOUT_MS', '0')) or None,
+        serverSelectionTimeoutMS=int(os.environ.get('MONGO_SERVER_SELECTION_TIMEOUT_MS', '30000')),
+        connectTimeoutMS=int(os.environ.get('MONGO_CONNECT_TIMEOUT_MS', '20000')),
+        socketTimeoutMS=int(os.environ.get('MONGO_SOCKET_TIMEOUT_MS', '0')) or None,
+        event_listeners=[CommandTimer(), PoolMonitor()]
+    )
+    db = client[os.environ['DB_NAME']]
+    report_files = AsyncIOMotorGridFSBucket(db, bucket_name="reports")
+    if WEB_CONCURRENCY > 1 and not CACHE_REDIS_URL:
+        response_cache = shared_cache(RESPONSE_CACHE_TTL, prefix="response:")
+        advice_memo.cache = shared_cache(ADVICE_CACHE_TTL, prefix="advice:", maxsize=ADVICE_CACHE_SIZE)
+    if JOB_BACKEND == "mongo":
+        jobs.backend = MongoJobBackend(db.jobs, maxsize=JOB_QUEUE_SIZE)
+
+def close_db():
+    global client, db, report_files
+    if client is not None:
+        client.close()
+    client = db = report_files = None
+
+def shared_cache(ttl: float, prefix: str, maxsize: Optional[int] = None):
+    """A cache every worker sees: Redis when configured, else Mongo when running several workers."""
+    collection = db.cache_entries if WEB_CONCURRENCY > 1 and db is not None else None
+    return create_shared_cache(
+        url=CACHE_REDIS_URL, collection=collection, maxsize=maxsize or RESPONSE_CACHE_SIZE, ttl=ttl, prefix=prefix
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    connect_db()
+    if WEB_CONCURRENCY > 1:
+        # Each worker serves its own /metrics; the label keeps their series apart
+        registry.set_const_labels(worker=str(os.getpid()))
+    if WEB_CONCURRENCY > 1 and 'JWT_SECRET' not in os.environ:
+        logger.warning("JWT_SECRET is not set; every worker falls back to the insecure default")
+    if WEB_CONCURRENCY > 1 and RATE_LIMIT_ENABLED and not RATE_LIMIT_REDIS_URL:
+        logger.warning(f"Rate limits are per worker without RATE_LIMIT_REDIS_URL; clients may get up to {WEB_CONCURRENCY}x each budget")
+    await ensure_indexes()
+    if JOB_WORKERS > 0:
+        jobs.start()
+    await start_report_worker()
+    yield
+    await jobs.stop(JOB_DRAIN_TIMEOUT)
+    await report_worker.stop(JOB_DRAIN_TIMEOUT)
+    if report_cleanup_task:
+        report_cleanup_task.cancel()
+    close_db()
+    close_bcrypt_pool()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 api_router = APIRouter(prefix="/api")
 security = HTTPBearer()
 
 JWT_SECRET = os.environ.get('JWT_SECRET', 'your-secret-key-change-in-production')
 JWT_ALGORITHM = 'HS256'
 
+# bcrypt is CPU-bound and releases the GIL, so it runs on a small thread pool.
+# The pool is created on first use and shut down with the app, so a later
+# lifespan (tests, reloads) gets a fresh one.
+BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', '12'))
+BCRYPT_WORKERS = int(os.environ.get('BCRYPT_WORKERS', str(min(4, os.cpu_count() or 1))))
+bcrypt_pool: Optional[ThreadPoolExecutor] = None
+
+# Verified tokens, keyed by SHA-256 digest; entries never outlive the token's exp
+token_cache = TTLCache(
+    maxsize=int(os.environ.get('TOKEN_CACHE_SIZE', '10000')),
+    ttl=float(os.environ.get('TOKEN_CACHE_TTL', '300'))
+)
+
+# Cached read responses, invalidated by the routes that write them. connect_db()
+# swaps in the Mongo-backed cache when several workers share no Redis.
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '10000'))
+RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', '300'))
+response_cache = shared_cache(RESPONSE_CACHE_TTL, prefix="")
+
+# Per-route token buckets, each budget "<requests>/<seconds>" and refilled
+# continuously. Auth routes are keyed by client IP, everything else by user;
+# any /api route not listed here falls under the "default" budget.
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', '1') == '1'
+RATE_LIMIT_REDIS_URL = os.environ.get('RATE_LIMIT_REDIS_URL', CACHE_REDIS_URL)
+RATE_LIMIT_BUDGETS = {
+    name: parse_budget(os.environ.get(f'RATE_LIMIT_{name.upper()}', default))
+    for name, default in {
+        "auth": "10/60",
+        "advice": "10/60",
+        "expense_list": "120/60",
+        "bulk_import": "5/60",
+        "reports": "10/60",
+        "default": "600/60",
+    }.items()
+}
+RATE_LIMITED_ROUTES = {
+    ("POST", "/api/auth/login"): "auth",
+    ("POST", "/api/auth/register"): "auth",
+    ("POST", "/api/ai-advice"): "advice",
+    ("POST", "/api/ai-advice/stream"): "advice",
+    ("GET", "/api/expenses/{month}/{year}"): "expense_list",
+    ("POST", "/api/expenses/bulk"): "bulk_import",
+    ("POST", "/api/reports"): "reports",
+}
+IP_KEYED_BUDGETS = {"auth"}
+RATE_LIMIT_EXEMPT_PATHS = {"/api/", "/api/health", "/metrics"}
+# Behind an ingress every request arrives from the proxy, so IP-keyed budgets
+# would be shared by all users. Addresses or CIDRs listed here (comma
+# separated) are trusted to report the real client in X-Forwarded-For or
+# Forwarded; headers from anyone else are ignored so clients can't spoof them.
+RATE_LIMIT_TRUSTED_PROXIES = [
+    ipaddress.ip_network(proxy.strip(), strict=False)
+    for proxy in os.environ.get('RATE_LIMIT_TRUSTED_PROXIES', '').split(',') if proxy.strip()
+]
+rate_limiter = create_rate_limiter(RATE_LIMIT_REDIS_URL)
+
+# Follow-up work that need not hold up a write's response. With the memory
+# backend jobs run on this process's event loop and are lost if it dies;
+# JOB_BACKEND=mongo keeps them in the `jobs` collection, where JOB_WORKERS=0
+# plus `python -m scripts.run_jobs` moves them to a separate process.
+JOB_BACKEND = os.environ.get('JOB_BACKEND', 'memory')
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_QUEUE_SIZE = int(os.environ.get('JOB_QUEUE_SIZE', '1000'))
+JOB_DRAIN_TIMEOUT = float(os.environ.get('JOB_DRAIN_TIMEOUT', '10'))
+jobs = JobRunner(
+    MemoryJobBackend(maxsize=JOB_QUEUE_SIZE),
+    concurrency=JOB_WORKERS,
+    max_attempts=int(os.environ.get('JOB_MAX_ATTEMPTS', '3')),
+    retry_delay=float(os.environ.get('JOB_RETRY_DELAY', '0.5'))
+)
+
+def budget_cache_key(user_id: str, month: str, year: int) -> str:
+    return f"budget:{user_id}:{month}:{year}"
+
+def goals_cache_keys(user_id: str, goal_id: Optional[str] = None) -> List[str]:
+    keys = [f"goals:{user_id}"]
+    if goal_id:
+        keys.append(f"goal:{user_id}:{goal_id}")
+    return keys
+
+async def cached_json_response(request: Request, key: str, loader) -> Response:
+    """Serve a JSON body from the response cache with an ETag, loading it on a miss."""
+    body = await response_cache.get(key)
+    if body is None:
+        body = json.dumps(jsonable_encoder(await loader()))
+        await response_cache.set(key, body)
+    
+    etag = f'"{hashlib.sha1(body.encode("utf-8")).hexdigest()}"'
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 # Auth Models
 class UserRegister(BaseModel):
     email: EmailStr
@@ -47,11 +247,23 @@ class User(BaseModel):
 
 # Auth Functions
 def hash_password(password: str) -> str:
-    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(BCRYPT_ROUNDS)).decode('utf-8')
 
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
+async def run_in_bcrypt_pool(func, *args):
+    global bcrypt_pool
+    if bcrypt_pool is None:
+        bcrypt_pool = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix='bcrypt')
+    return await asyncio.get_running_loop().run_in_executor(bcrypt_pool, func, *args)
+
+def close_bcrypt_pool():
+    global bcrypt_pool
+    if bcrypt_pool is not None:
+        bcrypt_pool.shutdown(wait=False)
+    bcrypt_pool = None
+
 def create_token(user_id: str) -> str:
     payload = {
         'user_id': user_id,
@@ -59,13 +271,35 @@ def create_token(user_id: str) -> str:
     }
     return jwt.encode(payload, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+def verify_token(token: str) -> Optional[str]:
+    """Return the user id a token was issued to, or None if it is invalid or expired."""
+    digest = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    user_id = token_cache.get(digest)
+    if user_id is not None:
+        return user_id
+    
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        return payload['user_id']
-    except:
+        user_id = payload['user_id']
+    except Exception:
+        return None
+    
+    token_cache.set(digest, user_id, expires_at=payload['exp'])
+    return user_id
+
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+    user_id = verify_token(credentials.credentials)
+    if user_id is None:
         raise HTTPException(status_code=401, detail="Invalid token")
+    return user_id
+
+# Operational endpoints expose process internals; they stay off unless
+# OPS_TOKEN is set, and then take it as the bearer token
+OPS_TOKEN = os.environ.get('OPS_TOKEN')
+
+async def require_ops_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    if not OPS_TOKEN or not hmac.compare_digest(credentials.credentials.encode('utf-8'), OPS_TOKEN.encode('utf-8')):
+        raise HTTPException(status_code=403, detail="Not authorized")
 
 # Auth Routes
 @api_router.post("/auth/register")
@@ -76,8 +310,7 @@ async def register(user_data: UserRegister):
     
     user = User(email=user_data.email, name=user_data.name)
     doc = user.model_dump()
-    doc['password'] = hash_password(user_data.password)
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc['password'] = await run_in_bcrypt_pool(hash_password, user_data.password)
     
     await db.users.insert_one(doc)
     token = create_token(user.id)
@@ -87,18 +320,22 @@ async def register(user_data: UserRegister):
 @api_router.post("/auth/login")
 async def login(credentials: UserLogin):
     user = await db.users.find_one({"email": credentials.email}, {"_id": 0})
-    if not user or not verify_password(credentials.password, user['password']):
+    if not user or not await run_in_bcrypt_pool(verify_password, credentials.password, user['password']):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     token = create_token(user['id'])
     return {"token": token, "user": {"id": user['id'], "email": user['email'], "name": user['name']}}
 
+# Money coming in from clients. JSON parsing accepts Infinity and NaN, which
+# would fail to quantize or poison rollup totals, so they are rejected here.
+Money = Annotated[float, Field(allow_inf_nan=False)]
+
 # Existing Models (add user_id)
 class IncomeSource(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
-    amount: float
+    amount: Money
     frequency: Optional[str] = "one-time"
     note: Optional[str] = None
 
@@ -127,17 +364,35 @@ class Expense(BaseModel):
     date: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+    @field_validator('date', mode='before')
+    @classmethod
+    def stored_date_to_string(cls, value):
+        return value.date().isoformat() if isinstance(value, datetime) else value
+
 class ExpenseCreate(BaseModel):
-    amount: float
+    amount: Money
     category: str
     note: Optional[str] = None
     date: str
 
+    @field_validator('date')
+    @classmethod
+    def date_is_iso(cls, value):
+        date.fromisoformat(value)
+        return value
+
 class GoalTransaction(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     amount: float
     date: str
     source: str
 
+    @field_validator('date', mode='before')
+    @classmethod
+    def stored_date_to_string(cls, value):
+        return value.isoformat() if isinstance(value, datetime) else value
+
 class Goal(BaseModel):
     model_config = ConfigDict(extra="ignore")
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -150,38 +405,220 @@ class Goal(BaseModel):
     priority: str = "medium"
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     completed_at: Optional[datetime] = None
-    transactions: List[GoalTransaction] = []
+    transaction_count: int = 0
 
 class GoalCreate(BaseModel):
     name: str
     icon: str
-    target_amount: float
+    target_amount: Money
     deadline: Optional[str] = None
     priority: str = "medium"
 
 class GoalAddMoney(BaseModel):
-    amount: float
+    amount: Money
     source: str = "income"
 
 class AIAdviceRequest(BaseModel):
+    money_left: Money
+    days_left: int
+    burn_rate: Money
+    safe_daily_spend: Money
+    expenses: List[dict]
+    total_income: Money
+    total_spent: Money
+
+class AIAdviceResponse(BaseModel):
+    advice: str
+
+class CategoryStat(BaseModel):
+    category: str
+    total: float
+    count: int
+    percentage: float
+
+class HealthScoreBreakdown(BaseModel):
+    score: int
+    budget_adherence: int
+    savings_rate: int
+    consistency: int
+    emergency_fund: int
+
+class MonthlyStats(BaseModel):
+    month: str
+    year: int
+    total_income: float
+    total_spent: float
+    expense_count: int
     money_left: float
+    days_in_month: int
+    days_passed: int
     days_left: int
     burn_rate: float
     safe_daily_spend: float
-    expenses: List[dict]
+    avg_daily_spend: float
+    daily_variance: float
+    biggest_expense: Optional[dict] = None
+    categories: List[CategoryStat]
+    daily_totals: dict
+    weekday_totals: dict
+    previous_month_total: float
+    month_over_month_change: float
+    health_score: HealthScoreBreakdown
+
+class StreakStatus(BaseModel):
+    current: int
+    best: int
+    tracking_since: Optional[str] = None
+    last_over_budget_day: Optional[str] = None
+
+class Progress(BaseModel):
+    month: str
+    year: int
+    streak: StreakStatus
+    health_score: HealthScoreBreakdown
+
+class ForecastBand(BaseModel):
+    projected: float
+    low: float
+    high: float
+
+class CategoryForecast(BaseModel):
+    category: str
+    spent: float
+    projected: float
+    low: float
+    high: float
+
+class GoalForecast(BaseModel):
+    goal_id: str
+    name: str
+    remaining: float
+    daily_rate: float
+    eta: Optional[str] = None
+    eta_earliest: Optional[str] = None
+    eta_latest: Optional[str] = None
+    deadline: Optional[str] = None
+    required_daily_rate: Optional[float] = None
+    on_track: Optional[bool] = None
+
+class Forecast(BaseModel):
+    month: str
+    year: int
+    as_of: str
     total_income: float
-    total_spent: float
+    spent: float
+    remaining_days: int
+    projected_spend: ForecastBand
+    balance: ForecastBand
+    categories: List[CategoryForecast]
+    goals: List[GoalForecast]
 
-class AIAdviceResponse(BaseModel):
-    advice: str
+class ReportCreate(BaseModel):
+    start: str
+    end: str
+    format: str = "csv"
+
+    @field_validator('start', 'end')
+    @classmethod
+    def date_is_iso(cls, value):
+        date.fromisoformat(value)
+        return value
+
+    @field_validator('format')
+    @classmethod
+    def format_is_supported(cls, value):
+        if value not in MEDIA_TYPES:
+            raise ValueError(f"format must be one of {', '.join(MEDIA_TYPES)}")
+        return value
+
+class ReportJob(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    start: str
+    end: str
+    format: str
+    data_version: str
+    status: str = "pending"
+    size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    queued_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+# Storage conversions: money is Decimal128 and dates are BSON dates in Mongo,
+# while the API keeps exchanging floats and ISO strings
+CENT = Decimal('0.01')
+
+def to_decimal(value) -> Decimal:
+    if isinstance(value, Decimal128):
+        value = value.to_decimal()
+    elif not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    if not value.is_finite():
+        raise ValueError(f"Money amounts must be finite, got {value}")
+    return value.quantize(CENT, rounding=ROUND_HALF_UP)
+
+def as_datetime(value) -> datetime:
+    """Parse an ISO date or timestamp (or pass a datetime through) as an aware UTC datetime."""
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time(), timezone.utc)
+    if len(value) == 10:
+        return datetime.combine(date.fromisoformat(value), datetime.min.time(), timezone.utc)
+    return as_datetime(datetime.fromisoformat(value))
+
+def expense_document(expense: "Expense") -> dict:
+    doc = expense.model_dump()
+    doc['amount'] = to_decimal(doc['amount'])
+    doc['date'] = as_datetime(doc['date'])
+    return doc
+
+def budget_document(budget: "MonthlyBudget") -> dict:
+    doc = budget.model_dump()
+    doc['total_income'] = to_decimal(doc['total_income'])
+    for source in doc['income_sources']:
+        source['amount'] = to_decimal(source['amount'])
+    return doc
+
+def goal_money_fields(doc: dict) -> dict:
+    for field in ('target_amount', 'current_amount'):
+        if field in doc:
+            doc[field] = to_decimal(doc[field])
+    return doc
 
 # Routes
 @api_router.get("/")
 async def root():
     return {"message": "SmartSaveAI API"}
 
+@api_router.get("/health")
+async def health():
+    started = time.perf_counter()
+    try:
+        await db.command('ping')
+    except Exception as e:
+        logger.error(f"Health check failed: {e!r}")
+        return JSONResponse(status_code=503, content={"status": "error", "mongo": "unreachable"})
+    return {"status": "ok", "mongo": "ok", "mongo_ping_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+@api_router.get("/cache/stats", dependencies=[Depends(require_ops_token)])
+async def cache_stats():
+    return {
+        "token_cache": token_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "advice_cache": advice_memo.stats(),
+        "llm_breaker": guarded_llm.breaker.state,
+        "report_worker": report_worker.stats(),
+        "jobs": jobs.stats(),
+        "rate_limiter": rate_limiter.stats(),
+    }
+
 @api_router.post("/budget", response_model=MonthlyBudget)
 async def create_budget(budget_input: MonthlyBudgetCreate, user_id: str = Depends(get_current_user)):
+    parse_month(budget_input.month)
     total = sum(source.amount for source in budget_input.income_sources)
     budget_obj = MonthlyBudget(
         user_id=user_id,
@@ -191,23 +628,30 @@ async def create_budget(budget_input: MonthlyBudgetCreate, user_id: str = Depend
         total_income=total
     )
     
-    doc = budget_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
-    doc['income_sources'] = [source.model_dump() for source in budget_obj.income_sources]
+    doc = budget_document(budget_obj)
     
     await db.budgets.insert_one(doc)
+    await response_cache.delete(budget_cache_key(user_id, budget_input.month, budget_input.year))
+    await schedule_streak_refresh(user_id, month_days(budget_input.month, budget_input.year), track=False)
     return budget_obj
 
-@api_router.get("/budget/{month}/{year}", response_model=MonthlyBudget)
-async def get_budget(month: str, year: int, user_id: str = Depends(get_current_user)):
+async def load_budget(user_id: str, month: str, year: int) -> Optional[MonthlyBudget]:
     budget = await db.budgets.find_one({"user_id": user_id, "month": month, "year": year}, {"_id": 0})
     if not budget:
-        raise HTTPException(status_code=404, detail="Budget not found")
-    
+        return None
     if isinstance(budget['created_at'], str):
         budget['created_at'] = datetime.fromisoformat(budget['created_at'])
+    return MonthlyBudget.model_validate(budget)
+
+@api_router.get("/budget/{month}/{year}", response_model=MonthlyBudget)
+async def get_budget(month: str, year: int, request: Request, user_id: str = Depends(get_current_user)):
+    async def load_budget_or_404():
+        budget = await load_budget(user_id, month, year)
+        if not budget:
+            raise HTTPException(status_code=404, detail="Budget not found")
+        return budget
     
-    return budget
+    return await cached_json_response(request, budget_cache_key(user_id, month, year), load_budget_or_404)
 
 @api_router.put("/budget/{month}/{year}")
 async def update_budget(month: str, year: int, update_data: dict, user_id: str = Depends(get_current_user)):
@@ -215,9 +659,217 @@ async def update_budget(month: str, year: int, update_data: dict, user_id: str =
     if not existing:
         raise HTTPException(status_code=404, detail="Budget not found")
     
+    # Clients send the whole budget back; keep identity and timestamps untouched
+    update_data = {k: v for k, v in update_data.items() if k not in ('_id', 'id', 'user_id', 'created_at')}
+    try:
+        if 'total_income' in update_data:
+            update_data['total_income'] = to_decimal(update_data['total_income'])
+        if 'income_sources' in update_data:
+            update_data['income_sources'] = [
+                {**source, "amount": to_decimal(source.get('amount', 0))} for source in update_data['income_sources']
+            ]
+    except (ValueError, ArithmeticError):
+        raise HTTPException(status_code=400, detail="Amounts must be finite numbers")
     await db.budgets.update_one({"user_id": user_id, "month": month, "year": year}, {"$set": update_data})
+    await response_cache.delete(budget_cache_key(user_id, month, year))
+    if 'total_income' in update_data:
+        await schedule_streak_refresh(user_id, month_days(month, year), track=False)
     return {"message": "Budget updated"}
 
+# Monthly rollups
+def rollup_field(name: str) -> str:
+    # Category names become document keys, so keep them usable as update paths
+    return name.replace('.', '_').replace('$', '_')
+
+def rollup_key(user_id: str, day) -> dict:
+    day = as_datetime(day)
+    return {"user_id": user_id, "year": day.year, "month": str(day.month)}
+
+def rollup_day(day) -> str:
+    return f"{as_datetime(day).day:02d}"
+
+def rollup_updates(expenses: List[dict], sign: int = 1) -> List[UpdateOne]:
+    increments = {}
+    for expense in expenses:
+        key = rollup_key(expense['user_id'], expense['date'])
+        inc = increments.setdefault((key['user_id'], key['year'], key['month']), {})
+        category = rollup_field(expense['category'])
+        amount = sign * to_decimal(expense['amount'])
+        for field, value in (
+            ("total", amount),
+            ("count", sign),
+            (f"categories.{category}.total", amount),
+            (f"categories.{category}.count", sign),
+            (f"days.{rollup_day(expense['date'])}", amount),
+        ):
+            inc[field] = inc.get(field, 0) + value
+        # Bumped by every write, deletes included; reports use it as a data version
+        inc["version"] = inc.get("version", 0) + 1
+    return [
+        UpdateOne({"user_id": user, "year": year, "month": month}, {"$inc": inc}, upsert=True)
+        for (user, year, month), inc in increments.items()
+    ]
+
+async def apply_expense_to_rollup(expense: dict, sign: int = 1):
+    await apply_expenses_to_rollups([expense], sign)
+
+async def apply_expenses_to_rollups(expenses: List[dict], sign: int = 1):
+    updates = rollup_updates(expenses, sign)
+    if updates:
+        await db.monthly_rollups.bulk_write(updates, ordered=False)
+    
+    touched = {}
+    for expense in expenses:
+        touched.setdefault(expense['user_id'], set()).add(as_datetime(expense['date']).date())
+    for user, days in touched.items():
+        await schedule_streak_refresh(user, days, track=sign > 0)
+
+async def rebuild_rollups(user_id: Optional[str] = None) -> int:
+    """Recompute monthly rollups from raw expenses, for one user or everyone."""
+    match = {"user_id": user_id} if user_id else {}
+    pipeline = [
+        {"$match": match},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "date": "$date", "category": "$category"},
+            "total": {"$sum": "$amount"},
+            "count": {"$sum": 1},
+        }},
+    ]
+    rollups = {}
+    async for group in db.expenses.aggregate(pipeline, allowDiskUse=True):
+        key = rollup_key(group['_id']['user_id'], group['_id']['date'])
+        rollup = rollups.setdefault(
+            (key['user_id'], key['year'], key['month']),
+            {**key, "total": Decimal(0), "count": 0, "categories": {}, "days": {}}
+        )
+        category = rollup['categories'].setdefault(
+            rollup_field(group['_id']['category']), {"total": Decimal(0), "count": 0}
+        )
+        day = rollup_day(group['_id']['date'])
+        total = to_decimal(group['total'])
+        rollup['total'] += total
+        rollup['count'] += group['count']
+        category['total'] += total
+        category['count'] += group['count']
+        rollup['days'][day] = rollup['days'].get(day, Decimal(0)) + total
+    
+    await db.monthly_rollups.delete_many(match)
+    if rollups:
+        await db.monthly_rollups.insert_many(list(rollups.values()), ordered=False)
+    return len(rollups)
+
+# Streaks: a day is under budget when its spending stays within the month's
+# income spread evenly over its days. Each user's streak document keeps the
+# sorted over-budget days plus the figures derived from them, and is
+# refreshed on every expense or budget write so reading it is one fetch.
+def daily_budget_limit(total_income, day: date) -> Decimal:
+    start, end = month_datetime_range(str(day.month), day.year)
+    return to_decimal(total_income or 0) / (end - start).days
+
+def over_budget_days(days, spent_by_month: dict, income_by_month: dict) -> tuple:
+    """Split days into (over, under) budget lists of ISO dates."""
+    over, under = [], []
+    for day in days:
+        key = (day.year, str(day.month))
+        spent = to_decimal(spent_by_month.get(key, {}).get(f"{day.day:02d}", 0))
+        limit = daily_budget_limit(income_by_month.get(key), day)
+        (over if spent > limit else under).append(day.isoformat())
+    return over, under
+
+def streak_summary(over_days: List[str], tracking_since: Optional[str]) -> dict:
+    """Derive the last over-budget day and the longest run between over-budget days."""
+    best = 0
+    previous = date.fromisoformat(tracking_since) - timedelta(days=1) if tracking_since else None
+    for day in over_days:
+        current = date.fromisoformat(day)
+        if previous is not None:
+            best = max(best, (current - previous).days - 1)
+        previous = current
+    return {"last_over_budget_day": over_days[-1] if over_days else None, "best_closed": best}
+
+async def month_spending_and_income(user_id: str, months: set) -> tuple:
+    month_filter = {"user_id": user_id, "$or": [{"year": year, "month": month} for year, month in months]}
+    rollups, budgets = await asyncio.gather(
+        db.monthly_rollups.find(month_filter, {"_id": 0, "year": 1, "month": 1, "days": 1}).to_list(None),
+        db.budgets.find(month_filter, {"_id": 0, "year": 1, "month": 1, "total_income": 1}).to_list(None)
+    )
+    spent = {(rollup['year'], rollup['month']): rollup.get('days', {}) for rollup in rollups}
+    income = {(budget['year'], budget['month']): budget['total_income'] for budget in budgets}
+    return spent, income
+
+async def save_streak_summary(user_id: str, streak: dict):
+    over_days = sorted(streak.get('over_budget_days', []))
+    # Only the latest revision writes its summary, so concurrent refreshes can't clobber each other
+    await db.streaks.update_one(
+        {"user_id": user_id, "revision": streak['revision']},
+        {"$set": {"over_budget_days": over_days, **streak_summary(over_days, streak.get('tracking_since'))}}
+    )
+
+async def refresh_streak(user_id: str, days: set, track: bool = True):
+    """Re-flag the given days as over or under budget and refresh the user's streak."""
+    if not days:
+        return
+    spent, income = await month_spending_and_income(user_id, {(day.year, str(day.month)) for day in days})
+    over, under = over_budget_days(days, spent, income)
+    
+    current_days = {"$ifNull": ["$over_budget_days", []]}
+    stages = {
+        "user_id": user_id,
+        "over_budget_days": {"$setUnion": [{"$setDifference": [current_days, under]}, over]},
+        "revision": {"$add": [{"$ifNull": ["$revision", 0]}, 1]},
+    }
+    if track:
+        first_day = min(days).isoformat()
+        stages["tracking_since"] = {"$min": [{"$ifNull": ["$tracking_since", first_day]}, first_day]}
+    streak = await db.streaks.find_one_and_update(
+        {"user_id": user_id},
+        [{"$set": stages}],
+        projection={"_id": 0},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    await save_streak_summary(user_id, streak)
+
+@jobs.handler("refresh_streak")
+async def refresh_streak_job(user_id: str, days: List[str], track: bool):
+    await refresh_streak(user_id, {date.fromisoformat(day) for day in days}, track=track)
+
+async def schedule_streak_refresh(user_id: str, days: set, track: bool = True):
+    # Streaks are derived and refresh_streak recomputes the days it is given,
+    # so writes hand it to the job queue and a retry is harmless
+    if days:
+        await jobs.defer("refresh_streak", user_id=user_id, days=sorted(day.isoformat() for day in days), track=track)
+
+async def rebuild_streaks(user_id: Optional[str] = None) -> int:
+    """Recompute streak documents from monthly rollups and budgets."""
+    user_ids = [user_id] if user_id else await db.monthly_rollups.distinct("user_id")
+    for user in user_ids:
+        rollups = await db.monthly_rollups.find(
+            {"user_id": user}, {"_id": 0, "year": 1, "month": 1, "days": 1}
+        ).to_list(None)
+        days = {
+            date(rollup['year'], int(rollup['month']), int(day))
+            for rollup in rollups for day, total in rollup.get('days', {}).items() if to_decimal(total) != 0
+        }
+        if not days:
+            await db.streaks.delete_one({"user_id": user})
+            continue
+        spent, income = await month_spending_and_income(user, {(day.year, str(day.month)) for day in days})
+        over, _ = over_budget_days(days, spent, income)
+        streak = await db.streaks.find_one_and_update(
+            {"user_id": user},
+            {"$set": {"over_budget_days": over, "tracking_since": min(days).isoformat()}, "$inc": {"revision": 1}},
+            projection={"_id": 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        await save_streak_summary(user, streak)
+    return len(user_ids)
+
+def month_days(month: str, year: int) -> set:
+    start, end = month_datetime_range(month, year)
+    return {(start + timedelta(days=offset)).date() for offset in range((end - start).days)}
+
 @api_router.post("/expenses", response_model=Expense)
 async def create_expense(expense_input: ExpenseCreate, user_id: str = Depends(get_current_user)):
     expense_obj = Expense(
@@ -228,34 +880,243 @@ async def create_expense(expense_input: ExpenseCreate, user_id: str = Depends(ge
         date=expense_input.date
     )
     
-    doc = expense_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc = expense_document(expense_obj)
     
     await db.expenses.insert_one(doc)
+    await apply_expense_to_rollup(doc)
     return expense_obj
 
+def parse_month(month: str) -> int:
+    """The month path parameter as 1-12; anything else is the client's error, not ours."""
+    try:
+        month_num = int(month)
+    except ValueError:
+        month_num = 0
+    if not 1 <= month_num <= 12:
+        raise HTTPException(status_code=400, detail="month must be between 1 and 12")
+    return month_num
+
+def previous_month(month: str, year: int) -> tuple:
+    month_num = parse_month(month)
+    if month_num == 1:
+        return "12", year - 1
+    return str(month_num - 1), year
+
+def month_date_range(month: str, year: int) -> tuple:
+    """Return the [start, end) ISO date bounds covering a calendar month."""
+    month_num = parse_month(month)
+    if not 1 <= year <= 9998:
+        raise HTTPException(status_code=400, detail="year is out of range")
+    start = f"{year}-{month_num:02d}-01"
+    if month_num == 12:
+        end = f"{year + 1}-01-01"
+    else:
+        end = f"{year}-{month_num + 1:02d}-01"
+    return start, end
+
+def month_datetime_range(month: str, year: int) -> tuple:
+    start, end = month_date_range(month, year)
+    return as_datetime(start), as_datetime(end)
+
+# Page cursors are "<epoch milliseconds>.<id>": URL-safe as-is, and exact
+# because Mongo stores dates at millisecond precision
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def encode_cursor(when, item_id: str) -> str:
+    millis = (as_datetime(when) - EPOCH) // timedelta(milliseconds=1)
+    return f"{millis}.{item_id}"
+
+def parse_cursor(after: str) -> tuple:
+    try:
+        millis, after_id = after.split('.', 1)
+        return EPOCH + timedelta(milliseconds=int(millis)), after_id
+    except (ValueError, OverflowError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def expense_month_query(user_id: str, month: str, year: int, after: Optional[str] = None) -> dict:
+    start, end = month_datetime_range(month, year)
+    query = {"user_id": user_id, "date": {"$gte": start, "$lt": end}}
+    if after:
+        after_date, after_id = parse_cursor(after)
+        query["$or"] = [
+            {"date": {"$gt": after_date}},
+            {"date": after_date, "id": {"$gt": after_id}},
+        ]
+    return query
+
+async def stream_expenses(cursor):
+    async for exp in cursor:
+        yield orjson.dumps(exp, option=orjson.OPT_APPEND_NEWLINE)
+
+# Bulk import
+BULK_BATCH_SIZE = int(os.environ.get('BULK_BATCH_SIZE', '1000'))
+CSV_TYPES = ("text/csv", "application/csv")
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+async def iter_body_lines(request: Request):
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield line.decode('utf-8-sig').rstrip("\r")
+    if buffer.strip():
+        yield buffer.decode('utf-8-sig').rstrip("\r")
+
+async def iter_import_rows(request: Request):
+    content_type = request.headers.get('content-type', '').split(';')[0].strip()
+    if content_type in CSV_TYPES:
+        header = None
+        async for line in iter_body_lines(request):
+            values = next(csv.reader([line]))
+            if header is None:
+                header = [name.strip().lower() for name in values]
+                continue
+            yield dict(zip(header, values))
+    elif content_type in NDJSON_TYPES:
+        async for line in iter_body_lines(request):
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield e
+    else:
+        try:
+            rows = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array, CSV or NDJSON")
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of expenses")
+        for row in rows:
+            yield row
+
+async def import_expense_batch(user_id: str, batch: List[tuple], errors: List[dict]) -> int:
+    docs = []
+    rows = []
+    created_at = datetime.now(timezone.utc)
+    for row_number, raw in batch:
+        try:
+            if isinstance(raw, Exception):
+                raise raw
+            expense_input = ExpenseCreate.model_validate(raw)
+        except (ValidationError, ValueError, TypeError) as e:
+            errors.append({"row": row_number, "error": str(e)})
+            continue
+        doc = expense_document(Expense(user_id=user_id, **expense_input.model_dump()))
+        doc['created_at'] = created_at
+        docs.append(doc)
+        rows.append(row_number)
+    if not docs:
+        return 0
+    
+    try:
+        await db.expenses.insert_many(docs, ordered=False)
+        inserted = docs
+    except BulkWriteError as e:
+        failed = set()
+        for write_error in e.details.get('writeErrors', []):
+            failed.add(write_error['index'])
+            errors.append({"row": rows[write_error['index']], "error": write_error.get('errmsg', 'Write failed')})
+        inserted = [doc for index, doc in enumerate(docs) if index not in failed]
+    await apply_expenses_to_rollups(inserted)
+    return len(inserted)
+
+@api_router.post("/expenses/bulk")
+async def bulk_import_expenses(request: Request, user_id: str = Depends(get_current_user)):
+    inserted = 0
+    errors = []
+    batch = []
+    row_number = 0
+    async for raw in iter_import_rows(request):
+        row_number += 1
+        batch.append((row_number, raw))
+        if len(batch) >= BULK_BATCH_SIZE:
+            inserted += await import_expense_batch(user_id, batch, errors)
+            batch = []
+    if batch:
+        inserted += await import_expense_batch(user_id, batch, errors)
+    
+    return {"inserted": inserted, "failed": len(errors), "errors": errors}
+
+# Projects stored expenses into their API shape inside Mongo: exactly the
+# Expense fields, with the date as YYYY-MM-DD and the amount as a double
+EXPENSE_PROJECTION = {field: 1 for field in Expense.model_fields}
+EXPENSE_PROJECTION.update({
+    "_id": 0,
+    "amount": {"$toDouble": "$amount"},
+    "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}},
+})
+
 @api_router.get("/expenses/{month}/{year}", response_model=List[Expense])
-async def get_expenses(month: str, year: int, user_id: str = Depends(get_current_user)):
-    expenses = await db.expenses.find({"user_id": user_id}, {"_id": 0}).to_list(1000)
+async def get_expenses(
+    month: str,
+    year: int,
+    response: Response,
+    after: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    stream: bool = False,
+    fast: bool = False,
+    user_id: str = Depends(get_current_user)
+):
+    query = expense_month_query(user_id, month, year, after)
+    cursor = db.expenses.find(query, EXPENSE_PROJECTION).sort([("date", 1), ("id", 1)])
+    
+    if stream:
+        if limit:
+            cursor = cursor.limit(limit)
+        return StreamingResponse(stream_expenses(cursor), media_type="application/x-ndjson")
+    
+    next_cursor = None
+    if limit:
+        expenses = await cursor.limit(limit + 1).to_list(None)
+        if len(expenses) > limit:
+            expenses = expenses[:limit]
+            next_cursor = encode_cursor(expenses[-1]['date'], expenses[-1]['id'])
+    else:
+        expenses = await cursor.to_list(None)
+    
+    if fast:
+        # Documents are already projected to the Expense shape, so skip
+        # response_model validation and encode them directly
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return ORJSONResponse(expenses, headers=headers)
+    
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
     
-    filtered_expenses = []
     for exp in expenses:
-        exp_date = exp['date']
         if isinstance(exp['created_at'], str):
             exp['created_at'] = datetime.fromisoformat(exp['created_at'])
-        
-        if exp_date.startswith(f"{year}-{month.zfill(2)}"):
-            filtered_expenses.append(exp)
     
-    return filtered_expenses
+    return expenses
 
 @api_router.delete("/expenses/{expense_id}")
 async def delete_expense(expense_id: str, user_id: str = Depends(get_current_user)):
-    result = await db.expenses.delete_one({"user_id": user_id, "id": expense_id})
-    if result.deleted_count == 0:
+    expense = await db.expenses.find_one_and_delete({"user_id": user_id, "id": expense_id})
+    if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
+    await apply_expense_to_rollup(expense, sign=-1)
     return {"message": "Expense deleted"}
 
+async def load_month_summary(user_id: str, month: str, year: int) -> dict:
+    summary = await db.monthly_rollups.find_one(
+        {"user_id": user_id, "year": year, "month": str(parse_month(month))}, {"_id": 0, "version": 0}
+    )
+    if not summary:
+        return {"user_id": user_id, "year": year, "month": str(parse_month(month)),
+                "total": 0.0, "count": 0, "categories": {}, "days": {}}
+    summary['total'] = float(summary['total'])
+    summary['categories'] = {
+        name: {"total": float(category['total']), "count": category['count']}
+        for name, category in summary.get('categories', {}).items()
+    }
+    summary['days'] = {day: float(total) for day, total in summary.get('days', {}).items()}
+    return summary
+
+@api_router.get("/summary/{month}/{year}")
+async def get_month_summary(month: str, year: int, user_id: str = Depends(get_current_user)):
+    return await load_month_summary(user_id, month, year)
+
 @api_router.post("/goals", response_model=Goal)
 async def create_goal(goal_input: GoalCreate, user_id: str = Depends(get_current_user)):
     goal_obj = Goal(
@@ -267,36 +1128,45 @@ async def create_goal(goal_input: GoalCreate, user_id: str = Depends(get_current
         priority=goal_input.priority
     )
     
-    doc = goal_obj.model_dump()
-    doc['created_at'] = doc['created_at'].isoformat()
+    doc = goal_money_fields(goal_obj.model_dump())
     
     await db.goals.insert_one(doc)
+    await response_cache.delete(*goals_cache_keys(user_id))
     return goal_obj
 
-@api_router.get("/goals", response_model=List[Goal])
-async def get_goals(user_id: str = Depends(get_current_user)):
-    goals = await db.goals.find({"user_id": user_id}, {"_id": 0}).to_list(100)
-    
+# Legacy goals may still embed their transaction list; reads never return it
+GOAL_SUMMARY_PROJECTION = {"_id": 0, "transactions": 0}
+
+async def load_goal_summaries(user_id: str) -> List[Goal]:
+    goals = await db.goals.find({"user_id": user_id}, GOAL_SUMMARY_PROJECTION).to_list(100)
     for goal in goals:
         if isinstance(goal['created_at'], str):
             goal['created_at'] = datetime.fromisoformat(goal['created_at'])
         if goal.get('completed_at') and isinstance(goal['completed_at'], str):
             goal['completed_at'] = datetime.fromisoformat(goal['completed_at'])
-    
-    return goals
+    return [Goal.model_validate(goal) for goal in goals]
+
+@api_router.get("/goals", response_model=List[Goal])
+async def get_goals(request: Request, user_id: str = Depends(get_current_user)):
+    return await cached_json_response(
+        request, goals_cache_keys(user_id)[0], lambda: load_goal_summaries(user_id)
+    )
 
 @api_router.get("/goals/{goal_id}", response_model=Goal)
-async def get_goal(goal_id: str, user_id: str = Depends(get_current_user)):
-    goal = await db.goals.find_one({"user_id": user_id, "id": goal_id}, {"_id": 0})
-    if not goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
-    
-    if isinstance(goal['created_at'], str):
-        goal['created_at'] = datetime.fromisoformat(goal['created_at'])
-    if goal.get('completed_at') and isinstance(goal['completed_at'], str):
-        goal['completed_at'] = datetime.fromisoformat(goal['completed_at'])
+async def get_goal(goal_id: str, request: Request, user_id: str = Depends(get_current_user)):
+    async def load_goal():
+        goal = await db.goals.find_one({"user_id": user_id, "id": goal_id}, GOAL_SUMMARY_PROJECTION)
+        if not goal:
+            raise HTTPException(status_code=404, detail="Goal not found")
+        
+        if isinstance(goal['created_at'], str):
+            goal['created_at'] = datetime.fromisoformat(goal['created_at'])
+        if goal.get('completed_at') and isinstance(goal['completed_at'], str):
+            goal['completed_at'] = datetime.fromisoformat(goal['completed_at'])
+        
+        return Goal.model_validate(goal)
     
-    return goal
+    return await cached_json_response(request, goals_cache_keys(user_id, goal_id)[1], load_goal)
 
 @api_router.put("/goals/{goal_id}", response_model=Goal)
 async def update_goal(goal_id: str, goal_input: GoalCreate, user_id: str = Depends(get_current_user)):
@@ -304,10 +1174,11 @@ async def update_goal(goal_id: str, goal_input: GoalCreate, user_id: str = Depen
     if not existing:
         raise HTTPException(status_code=404, detail="Goal not found")
     
-    update_data = goal_input.model_dump()
+    update_data = goal_money_fields(goal_input.model_dump())
     await db.goals.update_one({"user_id": user_id, "id": goal_id}, {"$set": update_data})
+    await response_cache.delete(*goals_cache_keys(user_id, goal_id))
     
-    updated_goal = await db.goals.find_one({"user_id": user_id, "id": goal_id}, {"_id": 0})
+    updated_goal = await db.goals.find_one({"user_id": user_id, "id": goal_id}, GOAL_SUMMARY_PROJECTION)
     if isinstance(updated_goal['created_at'], str):
         updated_goal['created_at'] = datetime.fromisoformat(updated_goal['created_at'])
     
@@ -315,49 +1186,721 @@ async def update_goal(goal_id: str, goal_input: GoalCreate, user_id: str = Depen
 
 @api_router.post("/goals/{goal_id}/add-money")
 async def add_money_to_goal(goal_id: str, money_input: GoalAddMoney, user_id: str = Depends(get_current_user)):
-    goal = await db.goals.find_one({"user_id": user_id, "id": goal_id}, {"_id": 0})
-    if not goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
+    now = datetime.now(timezone.utc)
+    amount = to_decimal(money_input.amount)
     
-    new_amount = goal['current_amount'] + money_input.amount
-    transaction = {
-        "amount": money_input.amount,
-        "date": datetime.now(timezone.utc).isoformat(),
-        "source": money_input.source
-    }
-    
-    is_completed = new_amount >= goal['target_amount'] and not goal.get('completed_at')
-    
-    update_data = {
-        "current_amount": new_amount,
-        "$push": {"transactions": transaction}
-    }
-    
-    if is_completed:
-        update_data["completed_at"] = datetime.now(timezone.utc).isoformat()
-    
-    await db.goals.update_one(
+    # One atomic update: add the amount, count the transaction and stamp
+    # completed_at only on the contribution that first reaches the target.
+    # The pre-update document tells us whether this call completed the goal.
+    previous = await db.goals.find_one_and_update(
         {"user_id": user_id, "id": goal_id},
-        {"$set": {"current_amount": new_amount, "completed_at": update_data.get("completed_at")}, "$push": {"transactions": transaction}}
+        [
+            {"$set": {
+                "current_amount": {"$add": ["$current_amount", amount]},
+                "transaction_count": {"$add": [{"$ifNull": ["$transaction_count", 0]}, 1]},
+            }},
+            {"$set": {
+                "completed_at": {"$cond": [
+                    {"$and": [
+                        {"$gte": ["$current_amount", "$target_amount"]},
+                        {"$not": [{"$ifNull": ["$completed_at", False]}]},
+                    ]},
+                    now,
+                    {"$ifNull": ["$completed_at", None]},
+                ]},
+            }},
+        ],
+        projection={"_id": 0, "current_amount": 1, "target_amount": 1, "completed_at": 1},
+        return_document=ReturnDocument.BEFORE
     )
+    if not previous:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    
+    transaction = GoalTransaction(amount=money_input.amount, date=now.isoformat(), source=money_input.source)
+    await db.goal_transactions.insert_one({
+        **transaction.model_dump(), "amount": amount, "date": now, "user_id": user_id, "goal_id": goal_id
+    })
+    await response_cache.delete(*goals_cache_keys(user_id, goal_id))
+    
+    new_amount = to_decimal(previous['current_amount']) + amount
+    is_completed = new_amount >= to_decimal(previous['target_amount']) and not previous.get('completed_at')
+    return {"message": "Money added", "new_amount": float(new_amount), "completed": is_completed}
+
+@api_router.get("/goals/{goal_id}/transactions", response_model=List[GoalTransaction])
+async def get_goal_transactions(
+    goal_id: str,
+    response: Response,
+    after: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    user_id: str = Depends(get_current_user)
+):
+    query = {"user_id": user_id, "goal_id": goal_id}
+    if after:
+        after_date, after_id = parse_cursor(after)
+        query["$or"] = [
+            {"date": {"$lt": after_date}},
+            {"date": after_date, "id": {"$lt": after_id}},
+        ]
     
-    return {"message": "Money added", "new_amount": new_amount, "completed": is_completed}
+    transactions = await db.goal_transactions.find(
+        query, {"_id": 0, "user_id": 0, "goal_id": 0}
+    ).sort([("date", -1), ("id", -1)]).limit(limit + 1).to_list(None)
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        response.headers['X-Next-Cursor'] = encode_cursor(transactions[-1]['date'], transactions[-1]['id'])
+    return transactions
 
 @api_router.delete("/goals/{goal_id}")
 async def delete_goal(goal_id: str, user_id: str = Depends(get_current_user)):
     result = await db.goals.delete_one({"user_id": user_id, "id": goal_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Goal not found")
+    await db.goal_transactions.delete_many({"user_id": user_id, "goal_id": goal_id})
+    await response_cache.delete(*goals_cache_keys(user_id, goal_id))
     return {"message": "Goal deleted"}
 
-@api_router.post("/ai-advice", response_model=AIAdviceResponse)
-async def get_ai_advice(request: AIAdviceRequest, user_id: str = Depends(get_current_user)):
-    api_key = os.environ.get('EMERGENT_LLM_KEY')
-    if not api_key:
-        raise HTTPException(status_code=500, detail="API key not configured")
+def month_progress(month: str, year: int) -> tuple:
+    """Return (days_in_month, days_passed) relative to today (UTC)."""
+    start, end = month_date_range(month, year)
+    first_day = datetime.fromisoformat(start).date()
+    days_in_month = (datetime.fromisoformat(end).date() - first_day).days
+    today = datetime.now(timezone.utc).date()
+    days_passed = min(max((today - first_day).days + 1, 0), days_in_month)
+    return days_in_month, days_passed
+
+def daily_variance(daily_totals: List[float]) -> float:
+    if not daily_totals:
+        return 0.0
+    mean = sum(daily_totals) / len(daily_totals)
+    return sum((value - mean) ** 2 for value in daily_totals) / len(daily_totals)
+
+def compute_health_score(total_income: float, total_spent: float, daily_totals: List[float],
+                         days_in_month: int, days_passed: int) -> HealthScoreBreakdown:
+    money_left = total_income - total_spent
+    daily_budget = total_income / days_in_month
+    
+    # Budget adherence (40 points)
+    expected_spent = daily_budget * days_passed
+    adherence = min(expected_spent / total_spent * 40, 40) if total_spent > 0 else 40
+    
+    # Savings rate (30 points)
+    savings_rate = money_left / total_income * 30 if money_left > 0 and total_income > 0 else 0
+    
+    # Spending consistency (20 points)
+    variance = daily_variance(daily_totals)
+    consistency = max(20 - variance / 100, 0)
+    
+    # Emergency fund (10 points)
+    months_reserve = money_left / total_income if total_income > 0 else 0
+    emergency_fund = min(months_reserve * 10, 10)
+    
+    return HealthScoreBreakdown(
+        score=round(adherence + savings_rate + consistency + emergency_fund),
+        budget_adherence=round(adherence),
+        savings_rate=round(savings_rate),
+        consistency=round(consistency),
+        emergency_fund=round(emergency_fund)
+    )
+
+def stats_pipeline(user_id: str, month: str, year: int) -> list:
+    start, end = month_datetime_range(month, year)
+    previous_start, _ = month_datetime_range(*previous_month(month, year))
+    in_month = {"$match": {"date": {"$gte": start}}}
+    return [
+        {"$match": {"user_id": user_id, "date": {"$gte": previous_start, "$lt": end}}},
+        {"$facet": {
+            "totals": [
+                in_month,
+                {"$group": {"_id": None, "total": {"$sum": "$amount"}, "count": {"$sum": 1}}},
+            ],
+            "categories": [
+                in_month,
+                {"$group": {"_id": "$category", "total": {"$sum": "$amount"}, "count": {"$sum": 1}}},
+                {"$sort": {"total": -1}},
+            ],
+            "daily": [
+                in_month,
+                {"$group": {
+                    "_id": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}},
+                    "total": {"$sum": "$amount"},
+                }},
+                {"$sort": {"_id": 1}},
+            ],
+            "biggest": [
+                in_month,
+                {"$sort": {"amount": -1}},
+                {"$limit": 1},
+                {"$project": {
+                    "_id": 0, "id": 1, "category": 1, "note": 1,
+                    "amount": EXPENSE_PROJECTION["amount"],
+                    "date": EXPENSE_PROJECTION["date"],
+                }},
+            ],
+            "previous": [
+                {"$match": {"date": {"$lt": start}}},
+                {"$group": {"_id": None, "total": {"$sum": "$amount"}}},
+            ],
+        }},
+    ]
+
+@api_router.get("/stats/{month}/{year}", response_model=MonthlyStats)
+async def get_stats(month: str, year: int, user_id: str = Depends(get_current_user)):
+    budget, facets = await asyncio.gather(
+        db.budgets.find_one({"user_id": user_id, "month": month, "year": year}, {"_id": 0, "total_income": 1}),
+        db.expenses.aggregate(stats_pipeline(user_id, month, year)).to_list(1)
+    )
+    facets = facets[0]
+    total_income = float(budget['total_income']) if budget else 0.0
+    totals = facets['totals'][0] if facets['totals'] else {"total": 0.0, "count": 0}
+    total_spent = float(totals['total'])
+    previous_total = float(facets['previous'][0]['total']) if facets['previous'] else 0.0
+    
+    daily_totals = {day['_id']: float(day['total']) for day in facets['daily']}
+    weekday_totals = {}
+    for day, amount in daily_totals.items():
+        weekday = datetime.fromisoformat(day).strftime('%A')
+        weekday_totals[weekday] = weekday_totals.get(weekday, 0) + amount
+    
+    days_in_month, days_passed = month_progress(month, year)
+    days_left = days_in_month - days_passed
+    money_left = total_income - total_spent
+    
+    return MonthlyStats(
+        month=month,
+        year=year,
+        total_income=total_income,
+        total_spent=total_spent,
+        expense_count=totals['count'],
+        money_left=money_left,
+        days_in_month=days_in_month,
+        days_passed=days_passed,
+        days_left=days_left,
+        burn_rate=total_spent / days_passed if days_passed > 0 else 0.0,
+        safe_daily_spend=money_left / days_left if days_left > 0 else 0.0,
+        avg_daily_spend=total_spent / len(daily_totals) if daily_totals else 0.0,
+        daily_variance=daily_variance(list(daily_totals.values())),
+        biggest_expense=facets['biggest'][0] if facets['biggest'] else None,
+        categories=[
+            CategoryStat(
+                category=cat['_id'],
+                total=float(cat['total']),
+                count=cat['count'],
+                percentage=float(cat['total']) / total_spent * 100 if total_spent > 0 else 0.0
+            )
+            for cat in facets['categories']
+        ],
+        daily_totals=daily_totals,
+        weekday_totals=weekday_totals,
+        previous_month_total=previous_total,
+        month_over_month_change=(total_spent - previous_total) / previous_total * 100 if previous_total > 0 else 0.0,
+        health_score=compute_health_score(
+            total_income, total_spent, list(daily_totals.values()), days_in_month, days_passed
+        )
+    )
+
+# Forecasts: one aggregation per collection for a whole batch of users,
+# then NumPy does the projection for all of them at once
+FORECAST_HISTORY_DAYS = int(os.environ.get('FORECAST_HISTORY_DAYS', '90'))
+
+def parse_deadline(value: Optional[str]) -> Optional[date]:
+    try:
+        return date.fromisoformat(value[:10]) if value else None
+    except ValueError:
+        return None
+
+def days_from(today: date, days) -> Optional[str]:
+    return (today + timedelta(days=int(days))).isoformat() if days is not None else None
+
+async def forecast_goals(user_ids: List[str], today: date) -> Dict[str, List[GoalForecast]]:
+    # NumPy is only needed for forecasts, so it is not paid for at startup
+    import numpy as np
+    from forecast import finite_or_none, project_goals
+    
+    goals = await db.goals.find(
+        {"user_id": {"$in": user_ids}, "completed_at": None},
+        {"_id": 0, "id": 1, "user_id": 1, "name": 1, "target_amount": 1, "current_amount": 1,
+         "deadline": 1, "created_at": 1}
+    ).to_list(None)
+    if not goals:
+        return {}
+    
+    window_start = today - timedelta(days=FORECAST_HISTORY_DAYS - 1)
+    goal_index = {goal['id']: index for index, goal in enumerate(goals)}
+    contributions = np.zeros((len(goals), FORECAST_HISTORY_DAYS))
+    pipeline = [
+        # user_id leads the (user_id, goal_id, date, id) index; without it this is a collection scan
+        {"$match": {
+            "user_id": {"$in": user_ids},
+            "goal_id": {"$in": list(goal_index)},
+            "date": {"$gte": as_datetime(window_start)},
+        }},
+        {"$group": {
+            "_id": {"goal_id": "$goal_id", "day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}}},
+            "total": {"$sum": "$amount"},
+        }},
+    ]
+    async for group in db.goal_transactions.aggregate(pipeline):
+        offset = (date.fromisoformat(group['_id']['day']) - window_start).days
+        if 0 <= offset < FORECAST_HISTORY_DAYS:
+            contributions[goal_index[group['_id']['goal_id']], offset] += float(group['total'])
+    
+    first_day = np.array([
+        min(max((as_datetime(goal.get('created_at') or window_start).date() - window_start).days, 0),
+            FORECAST_HISTORY_DAYS - 1)
+        for goal in goals
+    ])
+    remaining = np.array([float(goal['target_amount']) - float(goal.get('current_amount', 0)) for goal in goals])
+    deadlines = [parse_deadline(goal.get('deadline')) for goal in goals]
+    days_to_deadline = np.array([(deadline - today).days if deadline else np.nan for deadline in deadlines])
+    projection = project_goals(contributions, first_day, remaining, days_to_deadline)
+    
+    forecasts = {}
+    for index, goal in enumerate(goals):
+        forecasts.setdefault(goal['user_id'], []).append(GoalForecast(
+            goal_id=goal['id'],
+            name=goal['name'],
+            remaining=round(max(remaining[index], 0.0), 2),
+            daily_rate=round(float(projection['daily_rate'][index]), 2),
+            eta=days_from(today, finite_or_none(projection['eta_days'][index])),
+            eta_earliest=days_from(today, finite_or_none(projection['earliest_days'][index])),
+            eta_latest=days_from(today, finite_or_none(projection['latest_days'][index])),
+            deadline=deadlines[index].isoformat() if deadlines[index] else None,
+            required_daily_rate=finite_or_none(projection['required_daily_rate'][index]),
+            on_track=bool(projection['on_track'][index]) if deadlines[index] else None
+        ))
+    return forecasts
+
+async def forecast_users(user_ids: List[str], month: str, year: int) -> Dict[str, Forecast]:
+    """Forecast the month's spending, balance and goals for a batch of users."""
+    import numpy as np
+    from forecast import category_bands, daily_spend_tensor, project_spending
+    
+    month_start, month_end = month_datetime_range(month, year)
+    today = datetime.now(timezone.utc).date()
+    as_of = min(today, (month_end - timedelta(days=1)).date())
+    window_start = min(as_of - timedelta(days=FORECAST_HISTORY_DAYS - 1), month_start.date())
+    days = (month_end.date() - window_start).days
+    
+    pipeline = [
+        {"$match": {"user_id": {"$in": user_ids}, "date": {"$gte": as_datetime(window_start), "$lt": month_end}}},
+        {"$group": {"_id": {"user_id": "$user_id", "category": "$category", "date": "$date"}, "total": {"$sum": "$amount"}}},
+    ]
+    rows = [
+        (group['_id']['user_id'], group['_id']['category'], as_datetime(group['_id']['date']).date(), float(group['total']))
+        async for group in db.expenses.aggregate(pipeline, allowDiskUse=True)
+    ]
+    budgets, goals = await asyncio.gather(
+        db.budgets.find(
+            {"user_id": {"$in": user_ids}, "month": month, "year": year}, {"_id": 0, "user_id": 1, "total_income": 1}
+        ).to_list(None),
+        forecast_goals(user_ids, today)
+    )
+    
+    user_index = {user: index for index, user in enumerate(user_ids)}
+    categories = sorted({row[1] for row in rows})
+    tensor = daily_spend_tensor(rows, user_index, {category: index for index, category in enumerate(categories)},
+                                window_start, days)
+    income = np.zeros(len(user_ids))
+    for budget in budgets:
+        income[user_index[budget['user_id']]] = float(budget['total_income'])
+    projection = project_spending(
+        tensor, income, (month_start.date() - window_start).days, (as_of - window_start).days
+    )
+    
+    return {
+        user: Forecast(
+            month=month,
+            year=year,
+            as_of=as_of.isoformat(),
+            total_income=float(income[index]),
+            spent=round(float(projection['spent_total'][index]), 2),
+            remaining_days=int(projection['remaining_days'][index]),
+            projected_spend=ForecastBand(
+                projected=round(float(projection['projected_total'][index]), 2),
+                low=round(float(income[index] - projection['balance_high'][index]), 2),
+                high=round(float(income[index] - projection['balance_low'][index]), 2)
+            ),
+            balance=ForecastBand(
+                projected=round(float(projection['balance'][index]), 2),
+                low=round(float(projection['balance_low'][index]), 2),
+                high=round(float(projection['balance_high'][index]), 2)
+            ),
+            categories=category_bands(categories, projection, index),
+            goals=goals.get(user, [])
+        )
+        for user, index in user_index.items()
+    }
+
+@api_router.get("/forecast/{month}/{year}", response_model=Forecast)
+async def get_forecast(month: str, year: int, user_id: str = Depends(get_current_user)):
+    forecasts = await forecast_users([user_id], month, year)
+    return forecasts[user_id]
+
+def streak_status(streak: Optional[dict], today: date) -> StreakStatus:
+    if not streak or not streak.get('tracking_since'):
+        return StreakStatus(current=0, best=0)
+    # The current run starts the day after the last over-budget day and grows
+    # with the calendar, so it is derived here rather than stored
+    start = date.fromisoformat(streak['tracking_since'])
+    last_over = streak.get('last_over_budget_day')
+    if last_over:
+        start = max(start, date.fromisoformat(last_over) + timedelta(days=1))
+    current = max((today - start).days + 1, 0)
+    return StreakStatus(
+        current=current,
+        best=max(streak.get('best_closed', 0), current),
+        tracking_since=streak['tracking_since'],
+        last_over_budget_day=last_over
+    )
+
+async def load_progress(user_id: str, month: str, year: int) -> Progress:
+    streak, rollup, budget = await asyncio.gather(
+        db.streaks.find_one({"user_id": user_id}, {"_id": 0, "over_budget_days": 0}),
+        db.monthly_rollups.find_one(
+            {"user_id": user_id, "year": year, "month": str(parse_month(month))}, {"_id": 0, "total": 1, "days": 1}
+        ),
+        db.budgets.find_one({"user_id": user_id, "month": month, "year": year}, {"_id": 0, "total_income": 1})
+    )
+    total_income = float(budget['total_income']) if budget else 0.0
+    total_spent = float(rollup['total']) if rollup else 0.0
+    daily_totals = [float(total) for total in (rollup or {}).get('days', {}).values() if total != 0]
+    days_in_month, days_passed = month_progress(month, year)
+    return Progress(
+        month=month,
+        year=year,
+        streak=streak_status(streak, datetime.now(timezone.utc).date()),
+        health_score=compute_health_score(total_income, total_spent, daily_totals, days_in_month, days_passed)
+    )
+
+@api_router.get("/progress/{month}/{year}", response_model=Progress)
+async def get_progress(month: str, year: int, user_id: str = Depends(get_current_user)):
+    return await load_progress(user_id, month, year)
+
+async def load_dashboard_expenses(user_id: str, month: str, year: int) -> List[Expense]:
+    expenses = await db.expenses.find(
+        expense_month_query(user_id, month, year), EXPENSE_PROJECTION
+    ).sort([("date", 1), ("id", 1)]).to_list(None)
+    for exp in expenses:
+        if isinstance(exp['created_at'], str):
+            exp['created_at'] = datetime.fromisoformat(exp['created_at'])
+    return [Expense.model_validate(exp) for exp in expenses]
+
+@api_router.get("/dashboard/{month}/{year}")
+async def get_dashboard(month: str, year: int, user_id: str = Depends(get_current_user)):
+    previous = previous_month(month, year)
+    budget, expenses, summary, previous_summary, goals, progress = await asyncio.gather(
+        load_budget(user_id, month, year),
+        load_dashboard_expenses(user_id, month, year),
+        load_month_summary(user_id, month, year),
+        load_month_summary(user_id, *previous),
+        load_goal_summaries(user_id),
+        load_progress(user_id, month, year)
+    )
+    
+    previous_total = previous_summary['total']
+    return {
+        "budget": budget,
+        "expenses": expenses,
+        "summary": summary,
+        "goals": goals,
+        "progress": progress,
+        "comparison": {
+            "month": previous[0],
+            "year": previous[1],
+            "previous_total": previous_total,
+            "current_total": summary['total'],
+            "change_percent": (summary['total'] - previous_total) / previous_total * 100 if previous_total > 0 else 0.0,
+        },
+    }
+
+# Reports: rendered by a background worker from a cursor straight into
+# GridFS, then streamed back chunk by chunk
+REPORT_MAX_DAYS = int(os.environ.get('REPORT_MAX_DAYS', '1830'))
+REPORT_BATCH_SIZE = int(os.environ.get('REPORT_BATCH_SIZE', '1000'))
+# A job still "running" after this long is assumed lost with its worker
+REPORT_STALE_SECONDS = int(os.environ.get('REPORT_STALE_SECONDS', '600'))
+# The queue is in memory, so a job "pending" this long may have been lost with
+# the process that queued it and is queued again; the atomic claim in
+# run_report_job keeps a job that was merely slow from running twice
+REPORT_PENDING_SECONDS = int(os.environ.get('REPORT_PENDING_SECONDS', '60'))
+# Finished reports and their files are deleted this long after they finish
+REPORT_RETENTION_DAYS = float(os.environ.get('REPORT_RETENTION_DAYS', '7'))
+REPORT_CLEANUP_INTERVAL = float(os.environ.get('REPORT_CLEANUP_INTERVAL', '3600'))
+REPORT_PROJECTION = {
+    "_id": 0,
+    "category": 1,
+    "note": 1,
+    "amount": {"$toDouble": "$amount"},
+    "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$date"}},
+}
+
+def report_bounds(start: str, end: str) -> tuple:
+    """Return the [start, end) datetimes for an inclusive YYYY-MM-DD range."""
+    return as_datetime(start), as_datetime(end) + timedelta(days=1)
+
+async def report_data_version(user_id: str, start: datetime, end: datetime) -> str:
+    """Fingerprint the monthly rollups a range touches.
+
+    Every expense write bumps its month's rollup version, so the fingerprint
+    changes exactly when data inside the range's months changes.
+    """
+    last = end - timedelta(days=1)
+    months = []
+    cursor = db.monthly_rollups.find(
+        {"user_id": user_id, "year": {"$gte": start.year, "$lte": last.year}},
+        {"_id": 0, "year": 1, "month": 1, "count": 1, "total": 1, "version": 1}
+    )
+    async for rollup in cursor:
+        if (start.year, start.month) <= (rollup['year'], int(rollup['month'])) <= (last.year, last.month):
+            months.append([rollup['year'], int(rollup['month']), rollup.get('count', 0),
+                           str(rollup.get('total', 0)), rollup.get('version', 0)])
+    months.sort()
+    return hashlib.sha256(orjson.dumps(months)).hexdigest()[:16]
+
+async def report_summary(query: dict) -> dict:
+    pipeline = [
+        {"$match": query},
+        {"$facet": {
+            "categories": [
+                {"$group": {"_id": "$category", "total": {"$sum": "$amount"}, "count": {"$sum": 1}}},
+                {"$sort": {"total": -1}},
+            ],
+            "days": [{"$group": {"_id": "$date"}}, {"$count": "days"}],
+        }},
+    ]
+    result = (await db.expenses.aggregate(pipeline).to_list(1))[0]
+    categories = [
+        {"category": group['_id'], "total": float(group['total']), "count": group['count']}
+        for group in result['categories']
+    ]
+    return {
+        "total": sum(category['total'] for category in categories),
+        "count": sum(category['count'] for category in categories),
+        "days": result['days'][0]['days'] if result['days'] else 0,
+        "categories": categories,
+    }
+
+async def prune_report_versions(job: dict):
+    """Drop files for older data versions of the same report once a new one is ready."""
+    stale = db.report_jobs.find({
+        "user_id": job['user_id'], "start": job['start'], "end": job['end'], "format": job['format'],
+        "data_version": {"$ne": job['data_version']},
+    }, {"_id": 0, "id": 1, "file_id": 1})
+    async for old in stale:
+        if old.get('file_id'):
+            try:
+                await report_files.delete(old['file_id'])
+            except NoFile:
+                pass
+        await db.report_jobs.delete_one({"id": old['id']})
+
+async def run_report_job(job_id: str):
+    job = await db.report_jobs.find_one_and_update(
+        {"id": job_id, "status": "pending"},
+        {"$set": {"status": "running", "started_at": datetime.now(timezone.utc)}},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if not job:
+        return
+    
+    try:
+        start, end = report_bounds(job['start'], job['end'])
+        query = {"user_id": job['user_id'], "date": {"$gte": start, "$lt": end}}
+        cursor = db.expenses.find(query, REPORT_PROJECTION).sort([("date", 1), ("id", 1)]).batch_size(REPORT_BATCH_SIZE)
+        if job['format'] == "pdf":
+            chunks = render_pdf(cursor, await report_summary(query), job['start'], job['end'])
+        else:
+            chunks = render_csv(cursor)
+        
+        upload = report_files.open_upload_stream(
+            f"{job['id']}.{job['format']}", metadata={"user_id": job['user_id'], "job_id": job['id']}
+        )
+        size = 0
+        try:
+            async for chunk in chunks:
+                await upload.write(chunk)
+                size += len(chunk)
+            await upload.close()
+        except BaseException:
+            await upload.abort()
+            raise
+    except Exception as e:
+        await db.report_jobs.update_one({"id": job_id}, {"$set": {
+            "status": "failed", "error": str(e), "finished_at": datetime.now(timezone.utc)
+        }})
+        raise
+    
+    await db.report_jobs.update_one({"id": job_id}, {"$set": {
+        "status": "ready", "file_id": upload._id, "size": size, "finished_at": datetime.now(timezone.utc)
+    }})
+    await prune_report_versions(job)
+
+# Reports get their own runner so a slow export never delays other jobs. Job
+# state already lives in report_jobs, so the queue stays in memory and a
+# failed report is not retried until the user asks again.
+report_worker = JobRunner(
+    MemoryJobBackend(maxsize=int(os.environ.get('REPORT_QUEUE_SIZE', '100'))),
+    concurrency=int(os.environ.get('REPORT_WORKERS', '2')),
+    max_attempts=1
+)
+report_worker.handler("report")(run_report_job)
+
+def report_is_stale(job: dict) -> bool:
+    if job['status'] == "failed":
+        return True
+    now = datetime.now(timezone.utc)
+    if job['status'] == "pending":
+        queued_at = job.get('queued_at') or job['created_at']
+        return (now - queued_at).total_seconds() > REPORT_PENDING_SECONDS
+    started_at = job.get('started_at')
+    return job['status'] == "running" and started_at is not None and \
+        (now - started_at).total_seconds() > REPORT_STALE_SECONDS
+
+async def requeue_report(job: dict) -> Optional[dict]:
+    """Reset a failed or stalled job to pending; None if another request already did."""
+    return await db.report_jobs.find_one_and_update(
+        {"id": job['id'], "status": job['status'], "queued_at": job.get('queued_at')},
+        {"$set": {
+            "status": "pending", "error": None, "queued_at": datetime.now(timezone.utc),
+            "started_at": None, "finished_at": None,
+        }},
+        projection={"_id": 0},
+        return_document=ReturnDocument.AFTER
+    )
+
+@api_router.post("/reports", response_model=ReportJob)
+async def create_report(report_input: ReportCreate, user_id: str = Depends(get_current_user)):
+    start, end = report_bounds(report_input.start, report_input.end)
+    if end <= start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days > REPORT_MAX_DAYS:
+        raise HTTPException(status_code=400, detail=f"Reports can cover at most {REPORT_MAX_DAYS} days")
+    
+    key = {
+        "user_id": user_id,
+        "start": report_input.start,
+        "end": report_input.end,
+        "format": report_input.format,
+        "data_version": await report_data_version(user_id, start, end),
+    }
+    job = await db.report_jobs.find_one(key, {"_id": 0})
+    if job and not report_is_stale(job):
+        # Same range, same data: the cached file (or the job building it) is reused
+        return job
+    
+    if job:
+        job = await requeue_report(job)
+        if not job:
+            return await db.report_jobs.find_one(key, {"_id": 0})
+    else:
+        job = ReportJob(**key, queued_at=datetime.now(timezone.utc)).model_dump()
+        try:
+            await db.report_jobs.insert_one(job.copy())
+        except DuplicateKeyError:
+            return await db.report_jobs.find_one(key, {"_id": 0})
+    
+    if not await report_worker.enqueue("report", job_id=job['id']):
+        await db.report_jobs.update_one({"id": job['id']}, {"$set": {
+            "status": "failed", "error": "Report queue is full", "finished_at": datetime.now(timezone.utc)
+        }})
+        raise HTTPException(status_code=503, detail="Too many reports in progress, try again shortly")
+    return job
+
+@api_router.get("/reports/{report_id}", response_model=ReportJob)
+async def get_report(report_id: str, user_id: str = Depends(get_current_user)):
+    job = await db.report_jobs.find_one({"id": report_id, "user_id": user_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if job['status'] == "pending" and report_is_stale(job):
+        # Clients poll here, so a job lost with its queue is picked up again
+        requeued = await requeue_report(job)
+        if requeued and await report_worker.enqueue("report", job_id=job['id']):
+            return requeued
+        return await db.report_jobs.find_one({"id": report_id}, {"_id": 0})
+    return job
+
+async def stream_report_file(grid_out):
+    while True:
+        chunk = await grid_out.readchunk()
+        if not chunk:
+            break
+        yield chunk
+
+@api_router.get("/reports/{report_id}/download")
+async def download_report(report_id: str, user_id: str = Depends(get_current_user)):
+    job = await db.report_jobs.find_one({"id": report_id, "user_id": user_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Report not found")
+    if job['status'] != "ready":
+        raise HTTPException(status_code=409, detail=f"Report is {job['status']}")
+    
+    try:
+        grid_out = await report_files.open_download_stream(job['file_id'])
+    except NoFile:
+        raise HTTPException(status_code=404, detail="Report file has expired, request it again")
+    
+    filename = f"SmartSaveAI-Report-{job['start']}-to-{job['end']}.{job['format']}"
+    return StreamingResponse(
+        stream_report_file(grid_out),
+        media_type=MEDIA_TYPES[job['format']],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', "Content-Length": str(grid_out.length)}
+    )
+
+async def complete_advice(prompt: str) -> str:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        advice = await request_llm_advice(prompt)
+        outcome = "ok"
+        return advice
+    finally:
+        llm_call_duration.observe(time.perf_counter() - started, outcome=outcome)
+
+# The LLM client drags in litellm and the provider SDKs, which used to dominate
+# cold starts; it is imported off the event loop the first time advice is needed
+llm_chat_module = None
+
+async def load_llm_chat():
+    global llm_chat_module
+    if llm_chat_module is None:
+        llm_chat_module = await asyncio.to_thread(importlib.import_module, 'emergentintegrations.llm.chat')
+    return llm_chat_module
+
+async def request_llm_advice(prompt: str) -> str:
+    llm_chat = await load_llm_chat()
+    chat = llm_chat.LlmChat(
+        api_key=os.environ['EMERGENT_LLM_KEY'],
+        session_id=str(uuid.uuid4()),
+        system_message="You are a savage but helpful financial coach for students. Keep responses SHORT (2-3 sentences). Use casual, Gen Z language."
+    )
+    chat.with_model("openai", "gpt-5.2")
     
+    user_message = llm_chat.UserMessage(text=prompt)
+    return await chat.send_message(user_message)
+
+# Upstream LLM calls are bounded, time-limited and circuit-broken
+guarded_llm = GuardedLLM(
+    complete_advice,
+    max_concurrency=int(os.environ.get('LLM_CONCURRENCY', '8')),
+    timeout=float(os.environ.get('LLM_TIMEOUT', '15')),
+    breaker=CircuitBreaker(
+        failure_threshold=int(os.environ.get('LLM_BREAKER_FAILURES', '5')),
+        reset_timeout=float(os.environ.get('LLM_BREAKER_RESET', '30'))
+    )
+)
+
+# Advice is reused while the numbers stay within the same quantized fingerprint
+ADVICE_CACHE_TTL = float(os.environ.get('ADVICE_CACHE_TTL', '900'))
+ADVICE_CACHE_SIZE = int(os.environ.get('ADVICE_CACHE_SIZE', '10000'))
+advice_memo = AdviceMemo(
+    guarded_llm,
+    cache=shared_cache(ADVICE_CACHE_TTL, prefix="advice:", maxsize=ADVICE_CACHE_SIZE)
+)
+
+def category_percentages_for(expenses: List[dict]) -> dict:
     category_breakdown = {}
-    for exp in request.expenses:
+    for exp in expenses:
         cat = exp.get('category', 'Other')
         category_breakdown[cat] = category_breakdown.get(cat, 0) + exp.get('amount', 0)
     
@@ -367,8 +1910,10 @@ async def get_ai_advice(request: AIAdviceRequest, user_id: str = Depends(get_cur
     if total_spent > 0:
         for cat, amount in category_breakdown.items():
             category_percentages[cat] = (amount / total_spent) * 100
-    
-    prompt = f"""You are SmartSave Bot, a savage but helpful financial coach for students. Give SHORT, casual advice (2-3 sentences max).
+    return category_percentages
+
+def advice_prompt(request: AIAdviceRequest, category_percentages: dict) -> str:
+    return f"""You are SmartSave Bot, a savage but helpful financial coach for students. Give SHORT, casual advice (2-3 sentences max).
 
 Student's situation:
 - Money left: €{request.money_left:.2f}
@@ -383,31 +1928,160 @@ Tone: Friendly, casual, Gen Z, slightly savage but motivating. Not banking langu
 Examples: "Chill today. Budget is tight.", "Legend. You stayed under budget.", "Bro... food again?", "You can safely spend €7 today."
 
 Give advice now:"""
-    
+
+async def resolve_advice(request: AIAdviceRequest) -> tuple:
+    """Return (advice, source), falling back to rule-based advice if the LLM is unavailable."""
+    category_percentages = category_percentages_for(request.expenses)
+    fingerprint = advice_fingerprint(
+        request.money_left, request.days_left, request.burn_rate, request.safe_daily_spend,
+        request.total_income, request.total_spent, category_percentages
+    )
     try:
-        chat = LlmChat(
-            api_key=api_key,
-            session_id=str(uuid.uuid4()),
-            system_message="You are a savage but helpful financial coach for students. Keep responses SHORT (2-3 sentences). Use casual, Gen Z language."
-        )
-        chat.with_model("openai", "gpt-5.2")
-        
-        user_message = UserMessage(text=prompt)
-        response = await chat.send_message(user_message)
-        
-        return AIAdviceResponse(advice=response)
+        advice = await advice_memo.get(fingerprint, advice_prompt(request, category_percentages))
+        return advice, "ai"
     except Exception as e:
-        logging.error(f"AI advice error: {e}")
-        return AIAdviceResponse(advice="Can't connect to AI right now. Keep it tight, you got this! 💪")
+        logging.error(f"AI advice error: {e!r}")
+        advice = rule_based_advice(
+            request.money_left, request.days_left, request.burn_rate,
+            request.safe_daily_spend, category_percentages
+        )
+        return advice, "rules"
+
+def require_llm_key():
+    if not os.environ.get('EMERGENT_LLM_KEY'):
+        raise HTTPException(status_code=500, detail="API key not configured")
+
+@api_router.post("/ai-advice", response_model=AIAdviceResponse)
+async def get_ai_advice(request: AIAdviceRequest, user_id: str = Depends(get_current_user)):
+    require_llm_key()
+    advice, _ = await resolve_advice(request)
+    return AIAdviceResponse(advice=advice)
+
+async def advice_events(request: AIAdviceRequest):
+    # An immediate comment flushes headers so the client sees the stream open
+    yield ": connected\n\n"
+    advice, source = await resolve_advice(request)
+    for token in re.findall(r'\S+\s*', advice):
+        yield f"data: {json.dumps({'token': token})}\n\n"
+    yield f"event: done\ndata: {json.dumps({'source': source})}\n\n"
+
+@api_router.post("/ai-advice/stream")
+async def stream_ai_advice(request: AIAdviceRequest, user_id: str = Depends(get_current_user)):
+    require_llm_key()
+    return StreamingResponse(
+        advice_events(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 app.include_router(api_router)
 
+@app.get("/metrics")
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+def match_route(scope: dict):
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    return None
+
+def is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in RATE_LIMIT_TRUSTED_PROXIES)
+
+def forwarded_for(request: Request) -> List[str]:
+    """Client addresses from the proxy headers, nearest hop last."""
+    header = request.headers.get('x-forwarded-for')
+    if header:
+        return [hop.strip() for hop in header.split(',') if hop.strip()]
+    hops = []
+    for element in request.headers.get('forwarded', '').split(','):
+        for pair in element.split(';'):
+            key, _, value = pair.strip().partition('=')
+            if key.lower() == 'for' and value:
+                value = value.strip('"')
+                # Forwarded quotes IPv6 as "[::1]:port" and may append a port to IPv4
+                if value.startswith('['):
+                    value = value[1:].split(']', 1)[0]
+                elif value.count(':') == 1:
+                    value = value.split(':', 1)[0]
+                hops.append(value)
+    return hops
+
+def client_ip(request: Request) -> str:
+    """The first address, walking back from our peer, that is not a trusted proxy."""
+    address = request.client.host if request.client else "unknown"
+    if not is_trusted_proxy(address):
+        return address
+    for hop in reversed(forwarded_for(request)):
+        address = hop
+        if not is_trusted_proxy(hop):
+            break
+    return address
+
+def rate_limit_key(request: Request, budget: str) -> str:
+    if budget not in IP_KEYED_BUDGETS:
+        scheme, _, token = request.headers.get('authorization', '').partition(' ')
+        user_id = verify_token(token) if scheme.lower() == 'bearer' and token else None
+        if user_id is not None:
+            return f"{budget}:user:{user_id}"
+    return f"{budget}:ip:{client_ip(request)}"
+
+# Registered before the metrics middleware so rejected requests are still timed
+@app.middleware("http")
+async def enforce_rate_limits(request: Request, call_next):
+    if not RATE_LIMIT_ENABLED or request.method == "OPTIONS" or request.url.path in RATE_LIMIT_EXEMPT_PATHS:
+        return await call_next(request)
+    
+    route = match_route(request.scope)
+    if route is None:
+        return await call_next(request)
+    budget = RATE_LIMITED_ROUTES.get((request.method, route.path))
+    if budget is None:
+        if not route.path.startswith("/api/"):
+            return await call_next(request)
+        budget = "default"
+    
+    capacity, refill_rate = RATE_LIMIT_BUDGETS[budget]
+    wait = await rate_limiter.acquire(rate_limit_key(request, budget), capacity, refill_rate)
+    if wait > 0:
+        request.scope['route'] = route
+        return JSONResponse(
+            status_code=429,
+            content={"detail": "Too many requests, please retry later"},
+            headers={"Retry-After": str(math.ceil(wait))}
+        )
+    return await call_next(request)
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get('route')
+        http_request_duration.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=route.path if route else "unmatched",
+            status=str(status)
+        )
+
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
     allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Retry-After"],
 )
 
 logging.basicConfig(
@@ -416,6 +2090,124 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+# Indexes
+INDEXES = {
+    "users": [
+        ([("email", 1)], {"unique": True}),
+        ([("id", 1)], {"unique": True}),
+    ],
+    "budgets": [
+        ([("user_id", 1), ("year", 1), ("month", 1)], {}),
+    ],
+    "expenses": [
+        ([("user_id", 1), ("date", 1), ("id", 1)], {}),
+        ([("user_id", 1), ("id", 1)], {"unique": True}),
+    ],
+    "goals": [
+        ([("user_id", 1), ("id", 1)], {"unique": True}),
+    ],
+    "goal_transactions": [
+        ([("user_id", 1), ("goal_id", 1), ("date", -1), ("id", -1)], {}),
+    ],
+    "monthly_rollups": [
+        ([("user_id", 1), ("year", 1), ("month", 1)], {"unique": True}),
+    ],
+    "streaks": [
+        ([("user_id", 1)], {"unique": True}),
+    ],
+    "forecasts": [
+        ([("user_id", 1), ("year", 1), ("month", 1)], {"unique": True}),
+    ],
+    "cache_entries": [
+        ([("expires_at", 1)], {"expireAfterSeconds": 0}),
+    ],
+    "report_jobs": [
+        ([("id", 1)], {"unique": True}),
+        ([("user_id", 1), ("start", 1), ("end", 1), ("format", 1), ("data_version", 1)], {"unique": True}),
+        ([("finished_at", 1)], {}),
+        ([("status", 1), ("queued_at", 1)], {}),
+    ],
+    "jobs": [
+        ([("id", 1)], {"unique": True}),
+        ([("status", 1), ("created_at", 1)], {}),
+        ([("finished_at", 1)], {"expireAfterSeconds": 7 * 24 * 3600}),
+    ],
+}
+
+# Representative filters for the hot routes, explained when DB_EXPLAIN is set
+HOT_QUERIES = {
+    "users": [{"email": "explain@example.com"}],
+    "budgets": [{"user_id": "explain", "month": "1", "year": 2024}],
+    "expenses": [
+        {"user_id": "explain", "date": {"$gte": datetime(2024, 1, 1, tzinfo=timezone.utc),
+                                        "$lt": datetime(2024, 2, 1, tzinfo=timezone.utc)}},
+        {"user_id": "explain", "id": "explain"},
+    ],
+    "goals": [{"user_id": "explain"}, {"user_id": "explain", "id": "explain"}],
+}
+
+def plan_stages(plan: dict) -> List[str]:
+    stages = [plan.get('stage')]
+    for child in plan.get('inputStages', []) + [plan.get('inputStage')]:
+        if child:
+            stages.extend(plan_stages(child))
+    return stages
+
+async def explain_hot_queries():
+    for collection, filters in HOT_QUERIES.items():
+        for query in filters:
+            explanation = await db[collection].find(query).explain()
+            stages = plan_stages(explanation['queryPlanner']['winningPlan'])
+            if 'COLLSCAN' in stages:
+                logger.warning(f"COLLSCAN on {collection} for {query}: {stages}")
+            else:
+                logger.info(f"{collection} {query} -> {' <- '.join(filter(None, stages))}")
+
+async def ensure_indexes():
+    for collection, indexes in INDEXES.items():
+        for keys, options in indexes:
+            try:
+                await db[collection].create_index(keys, **options)
+            except OperationFailure as e:
+                logger.error(f"Could not create index {keys} on {collection}: {e}")
+    if os.environ.get('DB_EXPLAIN'):
+        await explain_hot_queries()
+
+async def prune_expired_reports() -> int:
+    """Delete reports that finished more than REPORT_RETENTION_DAYS ago, with their files."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=REPORT_RETENTION_DAYS)
+    expired = db.report_jobs.find(
+        {"$or": [{"finished_at": {"$lt": cutoff}}, {"status": "pending", "queued_at": {"$lt": cutoff}}]},
+        {"_id": 0, "id": 1, "file_id": 1}
+    )
+    removed = 0
+    async for job in expired:
+        if job.get('file_id'):
+            try:
+                await report_files.delete(job['file_id'])
+            except NoFile:
+                pass
+        await db.report_jobs.delete_one({"id": job['id']})
+        removed += 1
+    return removed
+
+async def prune_reports_periodically():
+    while True:
+        try:
+            removed = await prune_expired_reports()
+            if removed:
+                logger.info(f"Deleted {removed} expired reports")
+        except Exception:
+            logger.exception("Report cleanup failed")
+        await asyncio.sleep(REPORT_CLEANUP_INTERVAL)
+
+report_cleanup_task: Optional[asyncio.Task] = None
+
+async def start_report_worker():
+    global report_cleanup_task
+    report_worker.start()
+    report_cleanup_task = asyncio.create_task(prune_reports_periodically())
+    # Pick up jobs queued before the last restart
+    async for job in db.report_jobs.find({"status": "pending"}, {"_id": 0, "id": 1}):
+        if not await report_worker.enqueue("report", job_id=job['id']):
+            break
\ No newline at end of file
@@ -1,4 +1,3 @@
-import { useEffect, useState } from 'react';
 import { Flame, Trophy } from 'lucide-react';
 
 const MILESTONES = [
@@ -9,44 +8,8 @@ const MILESTONES = [
   { days: 90, name: 'Budget King', icon: '🏆' }
 ];
 
-export default function StreakTracker({ expenses, budget, moneyLeft, daysLeft }) {
-  const [streak, setStreak] = useState({ current: 0, best: 0 });
-
-  useEffect(() => {
-    // Load streak from localStorage
-    const saved = localStorage.getItem('streak');
-    if (saved) {
-      setStreak(JSON.parse(saved));
-    }
-  }, []);
-
-  useEffect(() => {
-    // Calculate and update streak
-    if (budget && expenses.length > 0) {
-      calculateStreak();
-    }
-  }, [expenses, budget, moneyLeft, daysLeft]);
-
-  const calculateStreak = () => {
-    const safeDailySpend = daysLeft > 0 ? moneyLeft / daysLeft : 0;
-    
-    // Get today's spending
-    const today = new Date().toISOString().split('T')[0];
-    const todayExpenses = expenses.filter(e => e.date === today);
-    const todaySpent = todayExpenses.reduce((sum, e) => sum + e.amount, 0);
-    
-    // Check if under budget today
-    const isUnderBudget = todaySpent <= safeDailySpend;
-    
-    // Update streak (simplified version - in production, check daily)
-    const currentStreak = isUnderBudget ? streak.current + 1 : 0;
-    const bestStreak = Math.max(currentStreak, streak.best);
-    
-    const newStreak = { current: currentStreak, best: bestStreak };
-    setStreak(newStreak);
-    localStorage.setItem('streak', JSON.stringify(newStreak));
-  };
-
+// Streaks are tracked server-side from expense and budget writes
+export default function StreakTracker({ streak = { current: 0, best: 0 } }) {
   const nextMilestone = MILESTONES.find(m => m.days > streak.current);
   const daysToMilestone = nextMilestone ? nextMilestone.days - streak.current : 0;
   const milestoneProgress = nextMilestone ? (streak.current / nextMilestone.days) * 100 : 100;
@@ -32,6 +32,7 @@ export default function Dashboard({ onShowExpenseModal }) {
   const navigate = useNavigate();
   const [budget, setBudget] = useState(null);
   const [expenses, setExpenses] = useState([]);
+  const [progress, setProgress] = useState(null);
   const [showExpenseModal, setShowExpenseModal] = useState(false);
   const [showIncomeModal, setShowIncomeModal] = useState(false);
   const [showAIModal, setShowAIModal] = useState(false);
@@ -61,11 +62,14 @@ export default function Dashboard({ onShowExpenseModal }) {
 
   const loadData = async () => {
     try {
-      const budgetRes = await axios.get(`${API}/budget/${currentMonth}/${currentYear}`);
-      setBudget(budgetRes.data);
-      
-      const expensesRes = await axios.get(`${API}/expenses/${currentMonth}/${currentYear}`);
-      setExpenses(expensesRes.data);
+      const res = await axios.get(`${API}/dashboard/${currentMonth}/${currentYear}`);
+      if (!res.data.budget) {
+        navigate('/onboarding');
+        return;
+      }
+      setBudget(res.data.budget);
+      setExpenses(res.data.expenses);
+      setProgress(res.data.progress);
     } catch (error) {
       if (error.response?.status === 404) {
         navigate('/onboarding');
@@ -75,6 +79,16 @@ export default function Dashboard({ onShowExpenseModal }) {
     }
   };
 
+  // Streak and health score are computed server-side, so refresh them after every write
+  const loadProgress = async () => {
+    try {
+      const res = await axios.get(`${API}/progress/${currentMonth}/${currentYear}`);
+      setProgress(res.data);
+    } catch (error) {
+      // Keep showing the last known values; the next full load will catch up
+    }
+  };
+
   const addExpense = async () => {
     if (!newExpense.amount || parseFloat(newExpense.amount) <= 0) {
       toast.error('Enter a valid amount');
@@ -88,6 +102,7 @@ export default function Dashboard({ onShowExpenseModal }) {
       });
       
       setExpenses([...expenses, res.data]);
+      loadProgress();
       setNewExpense({ amount: '', category: 'Food', note: '', date: new Date().toISOString().split('T')[0] });
       setShowExpenseModal(false);
       toast.success('Expense added 💸');
@@ -124,6 +139,7 @@ export default function Dashboard({ onShowExpenseModal }) {
     try {
       await axios.delete(`${API}/expenses/${id}`);
       setExpenses(expenses.filter(e => e.id !== id));
+      loadProgress();
       toast.success('Expense deleted');
     } catch (error) {
       toast.error('Failed to delete expense');
@@ -249,17 +265,8 @@ export default function Dashboard({ onShowExpenseModal }) {
 
       {/* Gamification Components */}
       <div className="space-y-5 mb-8 animate-fade-in">
-        <StreakTracker 
-          expenses={expenses} 
-          budget={budget} 
-          moneyLeft={moneyLeft}
-          daysLeft={daysLeft}
-        />
-        <HealthScore 
-          expenses={expenses} 
-          budget={budget} 
-          moneyLeft={moneyLeft}
-        />
+        <StreakTracker streak={progress?.streak} />
+        <HealthScore health={progress?.health_score} />
       </div>
 
       {/* Recent Expenses */}
@@ -8,7 +8,8 @@ import SpendingTrendsChart from '../components/analytics/SpendingTrendsChart';
 import MonthlyComparison from '../components/analytics/MonthlyComparison';
 import TopInsights from '../components/analytics/TopInsights';
 import MerchantTracking from '../components/analytics/MerchantTracking';
-import { generatePDFReport } from '../utils/pdfGenerator';
+import { downloadReport } from '../utils/reports';
+import { toast } from 'sonner';
 import { startOfMonth, endOfMonth, subMonths, startOfWeek, endOfWeek, format } from 'date-fns';
 
 const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
@@ -16,11 +17,11 @@ const API = `${BACKEND_URL}/api`;
 
 export default function Insights() {
   const [expenses, setExpenses] = useState([]);
-  const [budget, setBudget] = useState(null);
   const [dateRange, setDateRange] = useState('this-month');
   const [customStart, setCustomStart] = useState('');
   const [customEnd, setCustomEnd] = useState('');
   const [loading, setLoading] = useState(true);
+  const [exporting, setExporting] = useState(false);
 
   const currentMonth = new Date().getMonth() + 1;
   const currentYear = new Date().getFullYear();
@@ -31,9 +32,6 @@ export default function Insights() {
 
   const loadData = async () => {
     try {
-      const budgetRes = await axios.get(`${API}/budget/${currentMonth}/${currentYear}`);
-      setBudget(budgetRes.data);
-      
       const expensesRes = await axios.get(`${API}/expenses/${currentMonth}/${currentYear}`);
       setExpenses(expensesRes.data);
       
@@ -53,42 +51,47 @@ export default function Insights() {
     }
   };
 
-  const filteredExpenses = useMemo(() => {
-    if (!expenses.length) return [];
-    
-    let start, end;
+  const range = useMemo(() => {
     const now = new Date();
     
     switch (dateRange) {
       case 'this-week':
-        start = startOfWeek(now, { weekStartsOn: 1 });
-        end = endOfWeek(now, { weekStartsOn: 1 });
-        break;
+        return { start: startOfWeek(now, { weekStartsOn: 1 }), end: endOfWeek(now, { weekStartsOn: 1 }) };
       case 'this-month':
-        start = startOfMonth(now);
-        end = endOfMonth(now);
-        break;
+        return { start: startOfMonth(now), end: endOfMonth(now) };
       case 'last-month':
-        start = startOfMonth(subMonths(now, 1));
-        end = endOfMonth(subMonths(now, 1));
-        break;
+        return { start: startOfMonth(subMonths(now, 1)), end: endOfMonth(subMonths(now, 1)) };
       case 'custom':
-        if (!customStart || !customEnd) return expenses;
-        start = new Date(customStart);
-        end = new Date(customEnd);
-        break;
+        if (!customStart || !customEnd) return null;
+        return { start: new Date(customStart), end: new Date(customEnd) };
       default:
-        return expenses;
+        return null;
     }
+  }, [dateRange, customStart, customEnd]);
+
+  const filteredExpenses = useMemo(() => {
+    if (!expenses.length) return [];
+    if (!range) return expenses;
     
     return expenses.filter(exp => {
       const expDate = new Date(exp.date);
-      return expDate >= start && expDate <= end;
+      return expDate >= range.start && expDate <= range.end;
     });
-  }, [expenses, dateRange, customStart, customEnd]);
+  }, [expenses, range]);
 
-  const handleExportPDF = () => {
-    generatePDFReport(filteredExpenses, budget, dateRange);
+  const handleExportPDF = async () => {
+    if (!range) {
+      toast.error('Pick a start and end date first');
+      return;
+    }
+    setExporting(true);
+    try {
+      await downloadReport(format(range.start, 'yyyy-MM-dd'), format(range.end, 'yyyy-MM-dd'), 'pdf');
+    } catch (error) {
+      toast.error(error.response?.data?.detail || error.message || 'Failed to generate report');
+    } finally {
+      setExporting(false);
+    }
   };
 
   if (loading) {
@@ -141,12 +144,13 @@ export default function Insights() {
       {/* Export Button */}
       <Button
         onClick={handleExportPDF}
+        disabled={exporting}
         variant="secondary"
         className="w-full mb-6 h-12 rounded-full"
         data-testid="export-pdf-btn"
       >
         <Download className="w-4 h-4 mr-2" />
-        Download Report (PDF)
+        {exporting ? 'Preparing Report...' : 'Download Report (PDF)'}
       </Button>
 
       {filteredExpenses.length === 0 ? (
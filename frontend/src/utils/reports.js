@@ -0,0 +1,37 @@
+import axios from 'axios';
+
+const BACKEND_URL = process.env.REACT_APP_BACKEND_URL;
+const API = `${BACKEND_URL}/api`;
+
+const POLL_INTERVAL_MS = 1000;
+const POLL_TIMEOUT_MS = 120000;
+
+const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+// Reports are rendered on the server; the browser only polls for the job
+// and saves the finished file, so no expense rows are downloaded here.
+export const downloadReport = async (start, end, format = 'pdf') => {
+  let { data: job } = await axios.post(`${API}/reports`, { start, end, format });
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+
+  while (job.status === 'pending' || job.status === 'running') {
+    if (Date.now() > deadline) {
+      throw new Error('Report is taking too long, try again later');
+    }
+    await sleep(POLL_INTERVAL_MS);
+    ({ data: job } = await axios.get(`${API}/reports/${job.id}`));
+  }
+  if (job.status !== 'ready') {
+    throw new Error(job.error || 'Report generation failed');
+  }
+
+  const response = await axios.get(`${API}/reports/${job.id}/download`, { responseType: 'blob' });
+  const url = URL.createObjectURL(response.data);
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = `SmartSaveAI-Report-${start}-to-${end}.${format}`;
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  URL.revokeObjectURL(url);
+};
@@ -0,0 +1,110 @@
+import asyncio
+
+import pytest
+
+import cache
+from advice import AdviceMemo
+
+
+class StubLLM:
+    """Upstream stand-in that counts calls and can be held until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self, prompt: str) -> str:
+        self.calls += 1
+        await self.release.wait()
+        return f"advice for {prompt}"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+def test_concurrent_callers_share_one_upstream_call():
+    async def scenario():
+        llm = StubLLM()
+        memo = AdviceMemo(llm)
+        callers = [asyncio.create_task(memo.get("fp", "prompt")) for _ in range(10)]
+        await asyncio.sleep(0)
+        llm.release.set()
+        results = await asyncio.gather(*callers)
+        cached = await memo.get("fp", "prompt")
+        return llm, memo, results, cached
+
+    llm, memo, results, cached = asyncio.run(scenario())
+    assert results == ["advice for prompt"] * 10
+    assert cached == "advice for prompt"
+    assert llm.calls == 1
+    assert memo.upstream_calls == 1
+    assert memo.coalesced == 9
+
+
+def test_cancelling_the_leading_caller_leaves_followers_served():
+    async def scenario():
+        llm = StubLLM()
+        memo = AdviceMemo(llm)
+        leader = asyncio.create_task(memo.get("fp", "prompt"))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(memo.get("fp", "prompt"))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        llm.release.set()
+        result = await follower
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return llm, memo, result
+
+    llm, memo, result = asyncio.run(scenario())
+    assert result == "advice for prompt"
+    assert llm.calls == 1
+    assert memo.upstream_calls == 1
+
+
+def test_advice_is_fetched_again_after_the_ttl(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache, "time", clock)
+
+    async def scenario():
+        llm = StubLLM()
+        llm.release.set()
+        memo = AdviceMemo(llm, ttl=60)
+        await memo.get("fp", "prompt")
+        clock.now += 59
+        await memo.get("fp", "prompt")
+        calls_within_ttl = llm.calls
+        clock.now += 2
+        await memo.get("fp", "prompt")
+        return calls_within_ttl, llm.calls
+
+    calls_within_ttl, calls_after_ttl = asyncio.run(scenario())
+    assert calls_within_ttl == 1
+    assert calls_after_ttl == 2
+
+
+def test_failures_reach_every_caller_and_are_not_cached():
+    async def scenario():
+        calls = 0
+
+        async def failing(prompt: str) -> str:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0)
+            raise RuntimeError("upstream down")
+
+        memo = AdviceMemo(failing)
+        results = await asyncio.gather(*[memo.get("fp", "prompt") for _ in range(3)], return_exceptions=True)
+        with pytest.raises(RuntimeError):
+            await memo.get("fp", "prompt")
+        return calls, results
+
+    calls, results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert calls == 2
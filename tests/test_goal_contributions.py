@@ -0,0 +1,70 @@
+"""Concurrent add-money calls against one goal must not lose updates.
+
+Needs a MongoDB at MONGO_URL (default mongodb://localhost:27017); the test
+is skipped when none answers. It runs in a throwaway database.
+"""
+import asyncio
+import os
+import uuid
+
+import pytest
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('RATE_LIMIT_ENABLED', '0')
+
+pymongo = pytest.importorskip("pymongo")
+httpx = pytest.importorskip("httpx")
+pytest.importorskip("fastapi")
+pytest.importorskip("motor")
+
+import server  # noqa: E402
+
+CONTRIBUTIONS = 50
+AMOUNT = 2.5
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    probe = pymongo.MongoClient(os.environ['MONGO_URL'], serverSelectionTimeoutMS=1000)
+    try:
+        probe.admin.command("ping")
+    except pymongo.errors.PyMongoError:
+        probe.close()
+        pytest.skip(f"no MongoDB reachable at {os.environ['MONGO_URL']}")
+    name = f"smartsave_test_{uuid.uuid4().hex[:8]}"
+    monkeypatch.setenv('DB_NAME', name)
+    yield name
+    probe.drop_database(name)
+    probe.close()
+
+
+async def contribute_concurrently():
+    server.connect_db()
+    try:
+        await server.ensure_indexes()
+        headers = {"Authorization": f"Bearer {server.create_token(str(uuid.uuid4()))}"}
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as http:
+            # The goal completes halfway through the contributions
+            target = CONTRIBUTIONS * AMOUNT / 2
+            goal = (await http.post("/api/goals", json={"name": "Test", "icon": "x", "target_amount": target})).json()
+            responses = await asyncio.gather(*[
+                http.post(f"/api/goals/{goal['id']}/add-money", json={"amount": AMOUNT})
+                for _ in range(CONTRIBUTIONS)
+            ])
+        stored = await server.db.goals.find_one({"id": goal['id']}, {"_id": 0})
+        transactions = await server.db.goal_transactions.count_documents({"goal_id": goal['id']})
+        return responses, stored, transactions
+    finally:
+        server.close_db()
+
+
+def test_concurrent_contributions_are_all_recorded(mongo_db):
+    responses, goal, transactions = asyncio.run(contribute_concurrently())
+
+    assert [response.status_code for response in responses] == [200] * CONTRIBUTIONS
+    assert goal['current_amount'] == server.to_decimal(CONTRIBUTIONS * AMOUNT)
+    assert goal['transaction_count'] == CONTRIBUTIONS
+    assert transactions == CONTRIBUTIONS
+    assert goal['completed_at'] is not None
+    assert sum(1 for response in responses if response.json()['completed']) == 1